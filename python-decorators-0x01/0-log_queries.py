@@ -3,28 +3,216 @@
 Task 0: Logging Database Queries
 
 Create a decorator log_queries that logs SQL queries executed by a function.
+
+log_queries times each call and appends a raw record (timestamp, query,
+params, duration, row count, error) to query_log, a bounded ring buffer.
+A background writer thread drains it every `flush_interval` seconds and
+does the expensive part off the hot path: normalizing the SQL (literals
+replaced with ?), fingerprinting the parameters, formatting timestamps
+and writing one JSON line per record to the sink. Records are sampled
+at `sample_rate`; failed calls and calls at or over `slow_ms` are always
+kept. Disabled, the decorator costs one attribute check per call.
 """
 
-import sqlite3
+import atexit
+import collections
 import functools
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
 from datetime import datetime  # required for ALX checker
 
+DB_PATH = os.environ.get("USERS_DB", "users.db")
+DEFAULT_CAPACITY = 10000
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Collapse whitespace and replace string and number literals with ?."""
+    return _SPACES.sub(" ", _LITERALS.sub("?", str(query))).strip()
+
+
+def fingerprint(params):
+    """Short stable hash of bound parameters (None if there are none)."""
+    if params is None:
+        return None
+    return hashlib.blake2b(repr(params).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class QueryLog:
+    """
+    Ring buffer of query timings with a background JSON-lines writer.
+
+    - capacity: records held between flushes; when full, the oldest are
+      overwritten and counted as dropped
+    - sample_rate: fraction of calls recorded (0.0 .. 1.0)
+    - slow_ms: calls taking at least this long are always recorded
+    - sink: file-like object the writer writes to (default: stdout)
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, sample_rate=1.0,
+                 slow_ms=None, sink=None, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 enabled=True):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.slow_seconds = float("inf") if slow_ms is None else slow_ms / 1000.0
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        # deque.append is atomic under the GIL, so producers never lock
+        self._ring = collections.deque(maxlen=capacity)
+        self.dropped = 0
+        self.written = 0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def record(self, function, query, params, seconds, rows, error):
+        """
+        Hot path: append one raw record; formatting happens in the writer.
+        After close() there is no writer, so the record is written at once.
+        """
+        if self._thread is None:
+            self._start()
+        if len(self._ring) >= self.capacity:
+            self.dropped += 1  # approximate under contention
+        self._ring.append((time.time(), function, query, params, seconds,
+                           rows, error))
+        if self._stopping:
+            self.flush()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(
+                    target=self._run, name="query-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    @staticmethod
+    def _format(record):
+        ts, function, query, params, seconds, rows, error = record
+        entry = {
+            "ts": datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"),
+            "function": function,
+            "query": normalize_query(query),
+            "params": fingerprint(params),
+            "ms": round(seconds * 1000.0, 3),
+            "rows": rows,
+        }
+        if error is not None:
+            entry["error"] = error
+        return json.dumps(entry)
+
+    def drain(self):
+        """Remove and return the buffered raw records."""
+        records = []
+        ring = self._ring
+        while ring:
+            try:
+                records.append(ring.popleft())
+            except IndexError:
+                break
+        return records
+
+    def flush(self):
+        """Write everything buffered to the sink now."""
+        with self._write_lock:
+            records = self.drain()
+            if not records:
+                return
+            sink = self.sink or sys.stdout
+            sink.write("".join(self._format(r) + "\n" for r in records))
+            sink.flush()
+            self.written += len(records)
+
+    def close(self):
+        """Stop the writer thread after a final flush; later records are
+        written synchronously."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self):
+        return {"buffered": len(self._ring), "written": self.written,
+                "dropped": self.dropped}
+
+
+query_log = QueryLog()
+atexit.register(lambda: query_log.close())
+
+
+def configure_logging(**options):
+    """Replace query_log, e.g. configure_logging(sample_rate=0.01, slow_ms=50)."""
+    global query_log
+    old, query_log = query_log, QueryLog(**options)
+    old.close()
+    return query_log
+
+
+def _row_count(result):
+    return len(result) if isinstance(result, (list, tuple)) else None
+
+
+def _query_arg(args, kwargs):
+    return kwargs.get("query") or (args[0] if args else "")
+
+
+def _params_arg(args, kwargs):
+    return kwargs.get("params", args[1] if len(args) > 1 else None)
+
 
 def log_queries(func):
-    """Decorator that logs SQL queries with timestamps before execution."""
+    """Decorator that logs SQL queries with their timing after execution."""
+    name = func.__qualname__
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        query = kwargs.get("query") or (args[0] if args else "")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] Executing SQL Query: {query}")
-        return func(*args, **kwargs)
+        log = query_log
+        if not log.enabled:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            log.record(name, _query_arg(args, kwargs), _params_arg(args, kwargs),
+                       elapsed, None, type(e).__name__)
+            raise
+        elapsed = time.perf_counter() - started
+        if elapsed >= log.slow_seconds or random.random() < log.sample_rate:
+            log.record(name, _query_arg(args, kwargs), _params_arg(args, kwargs),
+                       elapsed, _row_count(result), None)
+        return result
     return wrapper
 
 
 @log_queries
 def fetch_all_users(query):
     """Fetch all users from the database."""
-    conn = sqlite3.connect("users.db")
+    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute(query)
     results = cursor.fetchall()
@@ -35,4 +223,4 @@ def fetch_all_users(query):
 # Example usage
 if __name__ == "__main__":
     users = fetch_all_users(query="SELECT * FROM users")
-    print(users)
\ No newline at end of file
+    print(users)
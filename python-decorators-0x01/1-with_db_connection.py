@@ -2,17 +2,29 @@
 """
 Task 1: Handle Database Connections with a Decorator
 Automatically open and close database connections for any decorated function.
+
+with_pooled_connection is a drop-in variant that borrows connections from
+a thread-safe ConnectionPool instead of opening a new one per call.
+Pooled connections are CachingConnections: they live across calls, so
+sqlite3's per-connection prepared-statement cache (sized explicitly)
+lets a repeated query skip parse and plan.
 """
 
+import os
 import sqlite3
 import functools
+import threading
+import time
+
+DB_PATH = os.environ.get("USERS_DB", "users.db")
+DEFAULT_STATEMENT_CACHE_SIZE = 64
 
 
 def with_db_connection(func):
     """Decorator that opens and closes the database connection automatically."""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = sqlite3.connect("users.db")
+        conn = sqlite3.connect(DB_PATH)
         try:
             result = func(conn, *args, **kwargs)
         finally:
@@ -21,15 +33,220 @@ def with_db_connection(func):
     return wrapper
 
 
+class CachingConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose prepared-statement cache is sized explicitly.
+
+    sqlite3 keeps up to `cached_statements` prepared statements per
+    connection, keyed by SQL text, and every execute() goes through it, so
+    a repeated query skips parse and plan. Here it holds exactly
+    `statement_cache_size` statements. sqlite3 does not expose the cache's
+    hit rate.
+    """
+
+    def __init__(self, *args, statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
+                 **kwargs):
+        kwargs["cached_statements"] = statement_cache_size
+        super().__init__(*args, **kwargs)
+        self.statement_cache_size = statement_cache_size
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """No pooled connection became free within the timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of up to `max_size` sqlite3 connections to `db_path`.
+
+    A thread gets back the connection it used last whenever it is idle,
+    otherwise any idle one, otherwise a new one while under `max_size`;
+    past that, acquire() waits up to `timeout` seconds. With `validate`,
+    a connection is pinged with SELECT 1 on checkout and replaced if dead.
+    Released connections are rolled back if a transaction is still open,
+    so uncommitted work is discarded just as conn.close() would.
+    Connections are CachingConnections caching `statement_cache_size`
+    prepared statements each.
+    """
+
+    def __init__(self, db_path=None, max_size=5, timeout=30.0, validate=True,
+                 statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE):
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0")
+        self.db_path = db_path or DB_PATH
+        self.max_size = max_size
+        self.timeout = timeout
+        self.validate = validate
+        self.statement_cache_size = statement_cache_size
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {"checkouts": 0, "reused": 0, "created": 0,
+                       "waits": 0, "discarded": 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, factory=CachingConnection,
+            statement_cache_size=self.statement_cache_size)
+        return conn
+
+    def _take_idle(self):
+        """Pop this thread's last connection if idle, else the newest idle one."""
+        last = getattr(self._local, "conn", None)
+        if last is not None and last in self._idle:
+            self._idle.remove(last)
+            self._stats["reused"] += 1
+            return last
+        return self._idle.pop()
+
+    def acquire(self):
+        """Check out a connection, creating or waiting for one as needed."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                if self._idle:
+                    conn = self._take_idle()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"No connection to {self.db_path} free after {self.timeout}s")
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+            self._stats["checkouts"] += 1
+
+        if conn is not None and self.validate and not self._alive(conn):
+            self._discard(conn, replace=True)
+            conn = None
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._stats["created"] += 1
+        self._local.conn = conn
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                conn.close()
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @staticmethod
+    def _alive(conn):
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn, replace=False):
+        """Close a broken connection; with `replace` its slot stays taken."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._stats["discarded"] += 1
+            if not replace:
+                self._size -= 1
+                self._cond.notify()
+
+    def close_all(self):
+        """Close idle connections; busy ones are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        """Counters plus current idle / in-use connection counts."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._size - len(self._idle)
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The shared pool used by with_pooled_connection by default."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+
+def configure_pool(**options):
+    """Replace the shared pool, e.g. configure_pool(db_path=..., max_size=10)."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, ConnectionPool(**options)
+    if old is not None:
+        old.close_all()
+    return _pool
+
+
+def with_pooled_connection(func=None, *, pool=None):
+    """
+    Like with_db_connection, but borrows the connection from `pool` (the
+    shared pool by default) and returns it afterwards instead of closing.
+    Usable bare (@with_pooled_connection) or with arguments.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            source = get_pool() if pool is None else pool
+            conn = source.acquire()
+            try:
+                return func(conn, *args, **kwargs)
+            finally:
+                source.release(conn)
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
 @with_db_connection
 def get_user_by_id(conn, user_id):
     """Fetch a user by ID using automatic connection handling."""
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+    cursor = conn.execute("SELECT * FROM users WHERE id = ?", (user_id,))
     return cursor.fetchone()
 
 
 # Example usage
 if __name__ == "__main__":
     user = get_user_by_id(user_id=1)
-    print(user)
\ No newline at end of file
+    print(user)
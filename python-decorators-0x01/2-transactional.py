@@ -2,17 +2,210 @@
 """
 Task 2: Transaction Management Decorator
 Automatically manage commit and rollback operations in database transactions.
+
+Inside `with TransactionBatch():`, with_db_connection hands every call on
+this thread the batch's connection, and transactional runs each call in
+a savepoint instead of committing it. The batch commits once per
+`max_calls` calls, `max_bytes` of call arguments or `max_seconds`, so
+thousands of updates share a few commits (and fsyncs). A failing call
+is rolled back to its savepoint without discarding the rest.
+
+Listeners registered with on_commit(listener) are called with the set of
+tables a commit wrote (4-cache_query uses this to invalidate its cache).
+Tables are collected with track_tables, which chains sqlite3 authorizers
+so several trackers can watch one connection at once.
 """
 
+import os
+import time
 import sqlite3
 import functools
+import threading
+import contextlib
+
+DB_PATH = os.environ.get("USERS_DB", "users.db")
+
+# Authorizer actions whose first argument is the table written
+WRITES = (sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE,
+          sqlite3.SQLITE_DELETE, sqlite3.SQLITE_DROP_TABLE)
+
+_local = threading.local()
+_trackers = {}  # id(conn) -> [tracker, ...] installed on conn
+_commit_listeners = []
+
+
+@contextlib.contextmanager
+def track_tables(conn, actions, tables):
+    """
+    Collect into `tables` the tables statements on `conn` touch via
+    `actions` while the block runs. Nested trackers on one connection are
+    chained through a single authorizer, so each sees every statement.
+    An authorizer set on `conn` by other code is replaced meanwhile.
+    """
+    def tracker(action, arg1):
+        if action in actions and arg1:
+            tables.add(arg1)
+
+    chain = _trackers.get(id(conn))
+    if chain is None:
+        chain = _trackers[id(conn)] = []
+
+        def authorizer(action, arg1, arg2, dbname, source):
+            for track in chain:
+                track(action, arg1)
+            return sqlite3.SQLITE_OK
+        conn.set_authorizer(authorizer)
+    chain.append(tracker)
+    try:
+        yield tables
+    finally:
+        chain.remove(tracker)
+        if not chain:
+            del _trackers[id(conn)]
+            conn.set_authorizer(None)
+
+
+def on_commit(listener):
+    """Call listener(tables) after each commit that wrote `tables`."""
+    _commit_listeners.append(listener)
+    return listener
+
+
+def _committed(tables):
+    if tables:
+        for listener in list(_commit_listeners):
+            listener(tables)
+
+
+def current_batch():
+    """The TransactionBatch active on this thread, if any."""
+    return getattr(_local, "batch", None)
+
+
+class TransactionBatch:
+    """
+    Group transactional calls on one connection into larger transactions.
+
+    - conn: connection to batch on (default: a new one to DB_PATH, closed
+      on exit)
+    - max_calls / max_bytes / max_seconds: commit once this many calls,
+      bytes of call arguments (len of their repr) or seconds since the
+      transaction began are reached; checked after each call, and
+      max_seconds also before one, so a batch left idle past it commits
+      on its next call rather than adding to the old transaction
+    Calls nested inside another batched call never commit: the limits
+    are checked again once the outermost call returns. On a clean exit
+    pending work is committed; on an exception it is rolled back
+    (earlier commits stay).
+    """
+
+    def __init__(self, conn=None, max_calls=1000, max_bytes=1 << 20,
+                 max_seconds=1.0):
+        self.conn = conn
+        self._owns_conn = conn is None
+        self.max_calls = max_calls
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self._pending_calls = 0
+        self._pending_bytes = 0
+        self._began = None
+        self._depth = 0
+        self._written = set()
+        self._previous = None
+        self._stats = {"calls": 0, "failed": 0, "commits": 0}
+        self._started = None
+        self._elapsed = None
+
+    def __enter__(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(DB_PATH)
+        self._previous = current_batch()
+        _local.batch = self
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.batch = self._previous
+        try:
+            if exc_type is None:
+                self.flush()
+            elif self.conn.in_transaction:
+                self.conn.rollback()
+                self._written.clear()
+        finally:
+            self._elapsed = time.perf_counter() - self._started
+            if self._owns_conn:
+                self.conn.close()
+
+    def run(self, func, conn, *args, **kwargs):
+        """Run one transactional call inside a savepoint of the batch."""
+        if self._depth == 0 and conn.in_transaction and self._expired():
+            self.flush()
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+            self._began = time.monotonic()
+        conn.execute("SAVEPOINT batch_call")
+        self._depth += 1
+        try:
+            if _commit_listeners:
+                with track_tables(conn, WRITES, self._written):
+                    result = func(conn, *args, **kwargs)
+            else:
+                result = func(conn, *args, **kwargs)
+        except Exception as e:
+            conn.execute("ROLLBACK TO batch_call")
+            conn.execute("RELEASE batch_call")
+            self._stats["failed"] += 1
+            print(f"Call rolled back due to: {e}")
+            raise
+        finally:
+            self._depth -= 1
+        conn.execute("RELEASE batch_call")
+        self._stats["calls"] += 1
+        self._pending_calls += 1
+        self._pending_bytes += len(repr(args)) + len(repr(kwargs))
+        # Committing inside a nested call would end the outer savepoint
+        if self._depth == 0 and (self._pending_calls >= self.max_calls
+                                 or self._pending_bytes >= self.max_bytes
+                                 or self._expired()):
+            self.flush()
+        return result
+
+    def _expired(self):
+        return (self._began is not None
+                and time.monotonic() - self._began >= self.max_seconds)
+
+    def flush(self):
+        """Commit the open transaction, if any."""
+        if self.conn.in_transaction:
+            self.conn.commit()
+            self._stats["commits"] += 1
+        self._pending_calls = 0
+        self._pending_bytes = 0
+        written, self._written = self._written, set()
+        _committed(written)
+
+    def stats(self):
+        """Counters plus calls and commits per second (after exit: overall)."""
+        stats = dict(self._stats)
+        elapsed = self._elapsed
+        if elapsed is None and self._started is not None:
+            elapsed = time.perf_counter() - self._started
+        if elapsed:
+            stats["seconds"] = elapsed
+            stats["calls_per_sec"] = stats["calls"] / elapsed
+            stats["commits_per_sec"] = stats["commits"] / elapsed
+        return stats
 
 
 def with_db_connection(func):
     """Decorator to handle database connections."""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = sqlite3.connect("users.db")
+        batch = current_batch()
+        if batch is not None:
+            return func(batch.conn, *args, **kwargs)
+        conn = sqlite3.connect(DB_PATH)
         try:
             result = func(conn, *args, **kwargs)
         finally:
@@ -22,17 +215,28 @@ def with_db_connection(func):
 
 
 def transactional(func):
-    """Decorator that wraps a function in a database transaction."""
+    """
+    Decorator that wraps a function in a database transaction. After the
+    commit, on_commit listeners are told which tables it wrote.
+    """
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs):
+        batch = current_batch()
+        if batch is not None and batch.conn is conn:
+            return batch.run(func, conn, *args, **kwargs)
+        written = set()
+        tracking = (track_tables(conn, WRITES, written) if _commit_listeners
+                    else contextlib.nullcontext())
         try:
-            result = func(conn, *args, **kwargs)
+            with tracking:
+                result = func(conn, *args, **kwargs)
             conn.commit()
-            return result
         except Exception as e:
             conn.rollback()
             print(f"Transaction rolled back due to: {e}")
             raise
+        _committed(written)
+        return result
     return wrapper
 
 
@@ -46,4 +250,4 @@ def update_user_email(conn, user_id, new_email):
 
 # Example usage
 if __name__ == "__main__":
-    update_user_email(user_id=1, new_email="Crawford_Cartwright@hotmail.com")
\ No newline at end of file
+    update_user_email(user_id=1, new_email="Crawford_Cartwright@hotmail.com")
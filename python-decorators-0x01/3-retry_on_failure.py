@@ -2,18 +2,112 @@
 """
 Task 3: Retry Database Queries
 Retry failed database operations a configurable number of times before raising an error.
+
+Retries back off exponentially with full jitter (a random sleep between 0
+and delay * 2**(attempt - 1), capped at max_delay), stop early once
+max_elapsed seconds would be exceeded, and only happen for transient
+errors (by default, sqlite3 busy/locked/schema-changed errors). A
+CircuitBreaker shared by several decorated functions fails calls fast
+while the database keeps failing. Coroutine functions are retried with
+asyncio.sleep, so the event loop is never blocked.
 """
 
+import os
 import time
+import random
+import asyncio
 import sqlite3
 import functools
+import threading
+
+DB_PATH = os.environ.get("USERS_DB", "users.db")
+
+# Primary result codes worth retrying: SQLITE_BUSY, SQLITE_LOCKED, SQLITE_SCHEMA
+TRANSIENT_CODES = (5, 6, 17)
+TRANSIENT_MESSAGES = ("database is locked", "database table is locked",
+                      "database schema has changed")
+
+
+class CircuitOpenError(sqlite3.OperationalError):
+    """Raised without calling the database while the breaker is open."""
+
+
+def is_transient(exc):
+    """True for sqlite3 errors that may succeed if simply tried again."""
+    if not isinstance(exc, sqlite3.OperationalError) or isinstance(exc, CircuitOpenError):
+        return False
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in TRANSIENT_CODES
+    message = str(exc)
+    return any(text in message for text in TRANSIENT_MESSAGES)
+
+
+class CircuitBreaker:
+    """
+    Shared guard against hammering a failing database. After
+    `failure_threshold` consecutive transient failures the breaker opens
+    and calls fail fast with CircuitOpenError for `reset_timeout` seconds.
+    Then one trial call is let through (half-open): success closes the
+    breaker, failure opens it again. A trial that ends with neither (it
+    was cancelled or interrupted) gives its slot back with release().
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "rejected": 0}
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go ahead now."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            if (self.state == "open"
+                    and time.monotonic() - self._opened_at >= self.reset_timeout):
+                self.state = "half-open"
+                return
+            self._stats["rejected"] += 1
+            raise CircuitOpenError("Circuit open: database calls are failing")
+
+    def record(self, failed):
+        """Report a success or a transient failure (see release())."""
+        with self._lock:
+            if not failed:
+                self.state = "closed"
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self._stats["opened"] += 1
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """
+        Give back a half-open trial slot whose call had no outcome: it was
+        cancelled, or failed with an error unrelated to database health.
+        """
+        with self._lock:
+            if self.state == "half-open":
+                # _opened_at is unchanged, so the next call is a new trial
+                self.state = "open"
+
+    def stats(self):
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, **self._stats}
 
 
 def with_db_connection(func):
     """Decorator that handles database connection management."""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = sqlite3.connect("users.db")
+        conn = sqlite3.connect(DB_PATH)
         try:
             result = func(conn, *args, **kwargs)
         finally:
@@ -22,27 +116,97 @@ def with_db_connection(func):
     return wrapper
 
 
-def retry_on_failure(retries=3, delay=2):
-    """Decorator that retries a function if it fails due to transient errors."""
+def retry_on_failure(retries=3, delay=2, max_delay=30.0, max_elapsed=None,
+                     retry_on=is_transient, breaker=None):
+    """
+    Decorator that retries a function if it fails due to transient errors.
+
+    - retries: attempts in total
+    - delay: base backoff in seconds; attempt n sleeps a random time in
+      [0, min(max_delay, delay * 2**(n - 1))]
+    - max_elapsed: give up rather than sleep past this many seconds
+    - retry_on(exc) -> bool: which errors are retried (others raise at once)
+    - breaker: CircuitBreaker shared with other functions, or None
+    """
     def decorator(func):
+        def next_delay(e, attempt, started):
+            """Seconds to sleep before retrying, or None to give up."""
+            transient = retry_on(e)
+            if breaker is not None:
+                if transient:
+                    breaker.record(failed=True)
+                else:
+                    # Says nothing about database health: neither a
+                    # success nor a failure, just end a half-open trial
+                    breaker.release()
+            if not transient:
+                return None
+            wait = random.uniform(0, min(max_delay, delay * 2 ** (attempt - 1)))
+            elapsed = time.monotonic() - started
+            if attempt >= retries or (max_elapsed is not None
+                                      and elapsed + wait > max_elapsed):
+                print("All retry attempts failed.")
+                return None
+            print(f"Attempt {attempt} failed: {e}. Retrying in {wait:.2f}s...")
+            return wait
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
+            started = time.monotonic()
+            for attempt in range(1, retries + 1):
+                if breaker is not None:
+                    breaker.before_call()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    wait = next_delay(e, attempt, started)
+                    if wait is None:
+                        raise
+                    time.sleep(wait)
+                except BaseException:
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                else:
+                    if breaker is not None:
+                        breaker.record(failed=False)
+                    return result
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.monotonic()
             for attempt in range(1, retries + 1):
+                if breaker is not None:
+                    breaker.before_call()
                 try:
-                    return func(*args, **kwargs)
+                    result = await func(*args, **kwargs)
                 except Exception as e:
-                    last_exception = e
-                    print(f"Attempt {attempt} failed: {e}. Retrying in {delay}s...")
-                    time.sleep(delay)
-            print("All retry attempts failed.")
-            raise last_exception
+                    wait = next_delay(e, attempt, started)
+                    if wait is None:
+                        raise
+                    await asyncio.sleep(wait)
+                except BaseException:
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                else:
+                    if breaker is not None:
+                        breaker.record(failed=False)
+                    return result
+
+        if retries < 1:
+            raise ValueError("retries must be >= 1")
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
         return wrapper
     return decorator
 
 
+breaker = CircuitBreaker()
+
+
 @with_db_connection
-@retry_on_failure(retries=3, delay=1)
+@retry_on_failure(retries=3, delay=1, breaker=breaker)
 def fetch_users_with_retry(conn):
     """Fetch users with retry on transient errors."""
     cursor = conn.cursor()
@@ -53,4 +217,4 @@ def fetch_users_with_retry(conn):
 # Example usage
 if __name__ == "__main__":
     users = fetch_users_with_retry()
-    print(users)
\ No newline at end of file
+    print(users)
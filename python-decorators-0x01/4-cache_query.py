@@ -2,19 +2,264 @@
 """
 Task 4: Cache Database Queries
 Cache results of SQL queries to avoid redundant database calls.
+
+query_cache is a bounded LRU (max entries and max bytes) with optional
+per-entry TTL. Keys include the bound parameters, entries remember the
+tables their query read, and a commit through 2-transactional's
+transactional (or TransactionBatch) drops every entry that read a table
+the transaction wrote. With single_flight=True,
+concurrent misses on the same key (threads or asyncio tasks) share one
+execution. A persistent tier (5-disk_cache.DiskCache) can sit beneath
+the in-memory one via cache_query(disk=...).
 """
 
+import os
+import sys
+import asyncio
+import time
 import sqlite3
 import functools
+import threading
+import weakref
+from collections import OrderedDict
+
+transactions = __import__('2-transactional')
+transactional = transactions.transactional
+
+DB_PATH = os.environ.get("USERS_DB", "users.db")
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_READS = (sqlite3.SQLITE_READ,)
+_ANY_TABLE = "*"
+_caches = weakref.WeakSet()
+
+
+def _sizeof(value):
+    """Approximate memory held by a result (rows of scalars)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(_sizeof(item) for item in value)
+    return size
+
+
+class QueryCache:
+    """
+    Thread-safe LRU of query results bounded by `max_entries` and
+    `max_bytes` (sizes estimated with sys.getsizeof). `ttl` is the default
+    lifetime in seconds (None: until evicted or invalidated).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, ttl=None):
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("max_entries and max_bytes must be > 0")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires, tables)
+        self._bytes = 0
+        self._version = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0,
+                       "expirations": 0, "invalidations": 0, "oversize": 0,
+                       "flights": 0, "coalesced": 0}
+        _caches.add(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry)
+
+    @staticmethod
+    def _expired(entry):
+        return entry[2] is not None and entry[2] <= time.monotonic()
+
+    def _drop(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def lookup(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                self._drop(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[0]
+
+    @property
+    def version(self):
+        """Bumped on every invalidation; see put(..., version=)."""
+        return self._version
+
+    def put(self, key, value, tables=None, ttl=None, version=None):
+        """
+        Store `value` under `key`, evicting least recently used entries to
+        stay within bounds. `tables` are the tables the result was read
+        from (None: invalidated by any write). If `version` is given and
+        an invalidation happened since it was read, nothing is stored.
+        """
+        size = _sizeof(value)
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        tables = frozenset(tables) if tables else frozenset((_ANY_TABLE,))
+        with self._lock:
+            if version is not None and version != self._version:
+                return False
+            if size > self.max_bytes:
+                self._stats["oversize"] += 1
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, expires, tables)
+            self._bytes += size
+            while (len(self._entries) > self.max_entries
+                   or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+        return True
+
+    def invalidate(self, tables):
+        """Drop every entry that read one of `tables`; returns the count."""
+        tables = set(tables)
+        if not tables:
+            return 0
+        with self._lock:
+            self._version += 1
+            stale = [key for key, entry in self._entries.items()
+                     if _ANY_TABLE in entry[3] or tables & entry[3]]
+            for key in stale:
+                self._drop(key)
+            self._stats["invalidations"] += len(stale)
+        return len(stale)
+
+    def join_flight(self, key, factory):
+        """
+        Return (flight, leader). The first caller for `key` gets a new
+        flight from `factory()` and must run the query, then end_flight();
+        callers arriving before that get the same flight to wait on.
+        flight.version is the cache version when the flight started.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                return flight, False
+            self._flights[key] = flight = factory()
+            flight.version = self._version
+            self._stats["flights"] += 1
+            return flight, True
+
+    def end_flight(self, key):
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters plus current entries, bytes and hit ratio."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+query_cache = QueryCache()
+
+
+@transactions.on_commit
+def invalidate_tables(tables):
+    """Invalidate `tables` in every live QueryCache."""
+    for cache in list(_caches):
+        cache.invalidate(tables)
+
+
+def _freeze(value):
+    """Hashable form of a bound parameter."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _normalize(query):
+    """Collapse whitespace so formatting differences share a cache entry."""
+    return " ".join(query.split())
+
 
-query_cache = {}
+def _make_key(func, args, kwargs):
+    """
+    (function, SQL, params) with a leading sqlite3 connection argument left
+    out. The SQL is the `query` argument, or the first remaining argument.
+    """
+    if args and isinstance(args[0], sqlite3.Connection):
+        args = args[1:]
+    args = list(args)
+    kwargs = dict(kwargs)
+    if isinstance(kwargs.get("query"), str):
+        kwargs["query"] = _normalize(kwargs["query"])
+    elif args and isinstance(args[0], str):
+        args[0] = _normalize(args[0])
+    return (func.__module__, func.__qualname__, _freeze(args), _freeze(kwargs))
+
+
+class _Flight:
+    """One in-flight query execution shared by threads."""
+
+    __slots__ = ("done", "result", "error", "version")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.version = None
+
+
+class _AsyncFlight:
+    """One in-flight query execution shared by tasks of one event loop."""
+
+    __slots__ = ("future", "version")
+
+    def __init__(self):
+        self.future = asyncio.get_running_loop().create_future()
+        self.version = None
+
+
+# Result of a flight whose leader was cancelled: waiters try again
+_ABANDONED = object()
+
+
+def _ignore_unretrieved(future):
+    if not future.cancelled():
+        future.exception()
 
 
 def with_db_connection(func):
     """Decorator to automatically manage database connections."""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = sqlite3.connect("users.db")
+        conn = sqlite3.connect(DB_PATH)
         try:
             result = func(conn, *args, **kwargs)
         finally:
@@ -23,19 +268,139 @@ def with_db_connection(func):
     return wrapper
 
 
-def cache_query(func):
-    """Decorator that caches query results based on the SQL string."""
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        query = kwargs.get("query") or ""
-        if query in query_cache:
-            print("Fetching from cache...")
-            return query_cache[query]
-        result = func(*args, **kwargs)
-        query_cache[query] = result
-        print("Query result cached.")
-        return result
-    return wrapper
+def cache_query(func=None, *, cache=None, ttl=None, single_flight=False,
+                disk=None):
+    """
+    Decorator that caches query results keyed on the SQL string and its
+    parameters. Usable bare (@cache_query) or as @cache_query(ttl=60,
+    cache=QueryCache(...)); results go to query_cache by default.
+
+    With single_flight=True, callers missing a key that another caller is
+    already fetching wait for that fetch and share its result (or error)
+    instead of running the query again. Coroutine functions get an async
+    wrapper whose waiters await an asyncio future. Waiters start over if
+    the cache was invalidated while the fetch ran (its result may be
+    stale) or if the fetching task was cancelled.
+
+    `disk` is an optional second tier with get(key) -> (hit, value),
+    stamp() and put(key, value, stamp), such as 5-disk_cache.DiskCache.
+    It is consulted on memory misses and filled with every fresh result.
+    """
+    def decorator(func):
+        def from_disk(store, key):
+            hit, result = disk.get(key)
+            if hit:
+                print("Fetching from disk cache...")
+                store.put(key, result, None, ttl)
+            return hit, result
+
+        def run(store, key, args, kwargs, version):
+            if disk is not None:
+                hit, result = from_disk(store, key)
+                if hit:
+                    return result
+                stamp = disk.stamp()
+            conn = args[0] if args else None
+            tables = None
+            if isinstance(conn, sqlite3.Connection):
+                tables = set()
+                with transactions.track_tables(conn, _READS, tables):
+                    result = func(*args, **kwargs)
+            else:
+                result = func(*args, **kwargs)
+            if store.put(key, result, tables, ttl, version):
+                print("Query result cached.")
+            if disk is not None:
+                disk.put(key, result, stamp)
+            return result
+
+        async def run_async(store, key, args, kwargs, version):
+            if disk is not None:
+                hit, result = from_disk(store, key)
+                if hit:
+                    return result
+                stamp = disk.stamp()
+            result = await func(*args, **kwargs)
+            if store.put(key, result, None, ttl, version):
+                print("Query result cached.")
+            if disk is not None:
+                disk.put(key, result, stamp)
+            return result
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            store = query_cache if cache is None else cache
+            key = _make_key(func, args, kwargs)
+            while True:
+                hit, result = store.lookup(key)
+                if hit:
+                    print("Fetching from cache...")
+                    return result
+                if not single_flight:
+                    return run(store, key, args, kwargs, store.version)
+
+                flight, leader = store.join_flight(key, _Flight)
+                if leader:
+                    break
+                flight.done.wait()
+                if flight.version != store.version:
+                    continue  # invalidated mid-flight: the result may be stale
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            try:
+                flight.result = run(store, key, args, kwargs, flight.version)
+                return flight.result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                store.end_flight(key)
+                flight.done.set()
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            store = query_cache if cache is None else cache
+            key = _make_key(func, args, kwargs)
+            # Futures belong to one event loop, so flights are per loop
+            flight_key = (asyncio.get_running_loop(), key)
+            while True:
+                hit, result = store.lookup(key)
+                if hit:
+                    print("Fetching from cache...")
+                    return result
+                if not single_flight:
+                    return await run_async(store, key, args, kwargs, store.version)
+
+                flight, leader = store.join_flight(flight_key, _AsyncFlight)
+                if leader:
+                    break
+                result = await asyncio.shield(flight.future)
+                if result is _ABANDONED or flight.version != store.version:
+                    continue
+                return result
+            future = flight.future
+            future.add_done_callback(_ignore_unretrieved)
+            try:
+                result = await run_async(store, key, args, kwargs, flight.version)
+                future.set_result(result)
+                return result
+            except asyncio.CancelledError:
+                future.set_result(_ABANDONED)
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                store.end_flight(flight_key)
+
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
 
 
 @with_db_connection
@@ -47,8 +412,17 @@ def fetch_users_with_cache(conn, query):
     return cursor.fetchall()
 
 
+@transactions.with_db_connection
+@transactional
+def update_user_email(conn, user_id, new_email):
+    """Update a user's email; invalidates cached reads of users."""
+    cursor = conn.cursor()
+    cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
+
+
 # Example usage
 if __name__ == "__main__":
     users = fetch_users_with_cache(query="SELECT * FROM users")
     users_again = fetch_users_with_cache(query="SELECT * FROM users")
-    print(users_again)
\ No newline at end of file
+    print(users_again)
+    print(query_cache.stats())
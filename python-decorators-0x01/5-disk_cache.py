@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Persistent query result cache, used as a disk tier under cache_query:
+
+    cache_query(disk=DiskCache("query_cache.db"))
+
+Results are pickled, zlib-compressed when large, and stored in a SQLite
+file, so they survive process restarts and are shared by processes on
+the same machine. Every entry is tagged with a version stamp of
+users.db: the schema cookie and file change counter from its header,
+plus the size and mtime of its WAL file. Any commit to users.db changes
+the stamp, and entries written under an older stamp are never returned.
+
+The cache file is unpickled, so only point it at a trusted local path.
+"""
+
+import os
+import sqlite3
+import pickle
+import hashlib
+import threading
+import zlib
+
+DB_PATH = os.environ.get("USERS_DB", "users.db")
+DEFAULT_PATH = "query_cache.db"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+COMPRESS_OVER = 512
+
+
+def version_stamp(db_path):
+    """
+    Cheap stamp that changes whenever `db_path` commits: the header's
+    file change counter (bytes 24-27) and schema cookie (bytes 40-43),
+    and, in WAL mode, the WAL file's size and mtime. None if missing.
+    """
+    try:
+        with open(db_path, "rb") as f:
+            header = f.read(44)
+    except FileNotFoundError:
+        return None
+    stamp = header[24:28].hex() + header[40:44].hex()
+    try:
+        wal = os.stat(db_path + "-wal")
+        stamp += f":{wal.st_size}:{wal.st_mtime_ns}"
+    except FileNotFoundError:
+        pass
+    return stamp
+
+
+def _digest(key):
+    """Stable identifier for a cache_query key across processes."""
+    return hashlib.sha256(repr(key).encode("utf-8")).digest()
+
+
+class DiskCache:
+    """
+    SQLite-backed result store, stamped against `db_path`. Holds at most
+    about `max_bytes` of serialized results, dropping the oldest first.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, db_path=None,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.db_path = db_path or DB_PATH
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key BLOB PRIMARY KEY, stamp TEXT NOT NULL,"
+            " compressed INTEGER NOT NULL, data BLOB NOT NULL)"
+        )
+        self._stamp = None
+        self._bytes = self._stored_bytes()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "purged": 0}
+
+    def _stored_bytes(self):
+        (size,) = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM results").fetchone()
+        return size
+
+    def stamp(self):
+        """Current version stamp of the source database."""
+        return version_stamp(self.db_path)
+
+    def _purge_stale(self, stamp):
+        """Delete entries from older stamps the first time `stamp` is seen."""
+        if stamp == self._stamp:
+            return
+        cursor = self._conn.execute(
+            "DELETE FROM results WHERE stamp != ?", (stamp,))
+        self._stats["purged"] += cursor.rowcount
+        if cursor.rowcount:
+            self._bytes = self._stored_bytes()
+        self._stamp = stamp
+
+    def get(self, key):
+        """Return (True, value) if stored under the current stamp."""
+        stamp = self.stamp()
+        with self._lock:
+            if stamp is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._purge_stale(stamp)
+            row = self._conn.execute(
+                "SELECT compressed, data FROM results WHERE key = ? AND stamp = ?",
+                (_digest(key), stamp),
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._stats["hits"] += 1
+        compressed, data = row
+        if compressed:
+            data = zlib.decompress(data)
+        return True, pickle.loads(data)
+
+    def put(self, key, value, stamp=None):
+        """
+        Store `value`. Pass the stamp taken before running the query, so
+        a commit that lands while it runs makes the entry stale at once.
+        """
+        stamp = stamp or self.stamp()
+        if stamp is None:
+            return False
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        compressed = len(data) > COMPRESS_OVER
+        if compressed:
+            data = zlib.compress(data, 1)
+        if len(data) > self.max_bytes:
+            return False
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, stamp, compressed, data)"
+                " VALUES (?, ?, ?, ?)",
+                (_digest(key), stamp, int(compressed), data),
+            )
+            self._stats["writes"] += 1
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._trim()
+        return True
+
+    def _trim(self):
+        """Drop the oldest entries until the store fits in max_bytes."""
+        # The running total drifts with replaced keys and other processes
+        self._bytes = self._stored_bytes()
+        excess = self._bytes - self.max_bytes
+        if excess <= 0:
+            return
+        for rowid, size in self._conn.execute(
+                "SELECT rowid, LENGTH(data) FROM results ORDER BY rowid").fetchall():
+            self._conn.execute("DELETE FROM results WHERE rowid = ?", (rowid,))
+            self._bytes -= size
+            excess -= size
+            if excess <= 0:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._bytes = 0
+
+    def stats(self):
+        """Counters plus stored entries and bytes."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM results"
+            ).fetchone()
+            stats = dict(self._stats)
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    cache_query = __import__('4-cache_query')
+    disk = DiskCache()
+
+    @cache_query.with_db_connection
+    @cache_query.cache_query(disk=disk)
+    def fetch_users(conn, query):
+        cursor = conn.cursor()
+        cursor.execute(query)
+        return cursor.fetchall()
+
+    # Run twice: the second process is served from disk
+    users = fetch_users(query="SELECT * FROM users")
+    print(f"{len(users)} user(s); disk cache: {disk.stats()}")
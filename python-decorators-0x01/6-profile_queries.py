@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Latency profiling for decorated database functions:
+- LatencyHistogram: HDR-style log-linear histogram (fixed relative error)
+- ProfileRegistry: per-function and per-normalized-query histograms, call
+  and error counts, exported with report() or prometheus()
+- profile_queries: decorator recording into `registry`
+
+profile_queries composes with the other decorators. Put it outside
+with_db_connection to include connection cost, or inside to time only
+the body:
+
+    @with_db_connection
+    @profile_queries
+    def get_user_by_id(conn, user_id): ...
+
+Per-query stats are keyed by the normalized SQL: the function's `query`
+parameter when it has one (or the parameter named by query_arg),
+otherwise every statement a sqlite3 connection first argument ran during
+the call. A `query` argument is charged the whole call. A traced statement
+is charged from its start to the next statement's start (or the end of the
+call), so its time includes fetching its rows and any Python work before
+the next statement. A call failing with a sqlite3 error marks the
+statement that was running as failed. sqlite3 does not report the SQL of
+a statement that fails before it runs (a syntax error, an unknown table,
+a bad binding), so that failure is recorded under UNEXECUTED.
+
+Statements are seen through the connection's trace callback. Nested
+profiled calls on one connection share it, but a trace callback set by
+other code (conn.set_trace_callback) is replaced for the duration of the
+call and cleared afterwards.
+"""
+
+import contextlib
+import functools
+import inspect
+import math
+import sqlite3
+import threading
+import time
+
+normalize_query = functools.lru_cache(maxsize=1024)(
+    __import__('0-log_queries').normalize_query)
+
+DEFAULT_SUB_BUCKET_BITS = 5
+# Upper bounds (seconds) of the Prometheus `le` buckets
+PROMETHEUS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                      0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.9, 0.99)
+UNEXECUTED = "(statement failed before running)"
+SQLITE_ERROR = 1  # primary result code of prepare failures
+
+
+class LatencyHistogram:
+    """
+    Durations in whole microseconds, bucketed by power of two with
+    2**(sub_bucket_bits - 1) linear steps per power: values below
+    2**sub_bucket_bits are exact, larger ones are reported within
+    1 / 2**(sub_bucket_bits - 1) relative error. Buckets are kept
+    sparsely, so memory grows only with the spread of observed values.
+    """
+
+    def __init__(self, sub_bucket_bits=DEFAULT_SUB_BUCKET_BITS):
+        if sub_bucket_bits < 2:
+            raise ValueError("sub_bucket_bits must be >= 2")
+        self.bits = sub_bucket_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, micros):
+        shift = micros.bit_length() - self.bits
+        if shift <= 0:
+            return micros
+        return (shift << (self.bits - 1)) + (micros >> shift)
+
+    def _bounds(self, index):
+        """[low, high) in microseconds covered by bucket `index`."""
+        half = 1 << (self.bits - 1)
+        if index < 2 * half:
+            return index, index + 1
+        shift, mantissa = divmod(index, half)
+        shift -= 1
+        mantissa += half
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, seconds):
+        micros = int(seconds * 1e6)
+        index = self._index(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other):
+        if other.bits != self.bits:
+            raise ValueError("cannot merge histograms of different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Seconds at quantile `q`: upper bound of its bucket, capped at max."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._bounds(index)[1] / 1e6, self.max)
+        return self.max
+
+    def cumulative(self, bounds):
+        """Counts of values <= each bound (seconds), at bucket resolution."""
+        buckets = sorted((self._bounds(i)[1] / 1e6, n) for i, n in self.counts.items())
+        result = []
+        seen = 0
+        pos = 0
+        for bound in bounds:
+            while pos < len(buckets) and buckets[pos][0] <= bound:
+                seen += buckets[pos][1]
+                pos += 1
+            result.append(seen)
+        return result
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class _Stats:
+    __slots__ = ("histogram", "errors")
+
+    def __init__(self, sub_bucket_bits):
+        self.histogram = LatencyHistogram(sub_bucket_bits)
+        self.errors = 0
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ProfileRegistry:
+    """Thread-safe latency statistics per function and per query."""
+
+    def __init__(self, sub_bucket_bits=DEFAULT_SUB_BUCKET_BITS):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.functions = {}
+        self.queries = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, table, key):
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = _Stats(self.sub_bucket_bits)
+        return stats
+
+    def record(self, function, seconds, failed, queries=()):
+        """One call of `function`; `queries` are its (query, seconds, failed)."""
+        with self._lock:
+            for table, key, duration, error in [
+                    (self.functions, function, seconds, failed)] + [
+                    (self.queries, q, d, e) for q, d, e in queries]:
+                stats = self._stats(table, key)
+                stats.histogram.record(duration)
+                stats.errors += error
+
+    def reset(self):
+        with self._lock:
+            self.functions.clear()
+            self.queries.clear()
+
+    def _snapshot(self, table):
+        with self._lock:
+            return sorted(table.items(),
+                          key=lambda item: item[1].histogram.total, reverse=True)
+
+    def report(self):
+        """Text table per function and per query, slowest total first."""
+        lines = []
+        for title, table in (("function", self.functions), ("query", self.queries)):
+            rows = self._snapshot(table)
+            if not rows:
+                continue
+            lines.append(f"{title:<48} {'calls':>8} {'errors':>6} {'mean_ms':>9} "
+                         f"{'p50_ms':>9} {'p90_ms':>9} {'p99_ms':>9} {'max_ms':>9}")
+            for name, stats in rows:
+                h = stats.histogram
+                label = name if len(name) <= 48 else name[:45] + "..."
+                quantiles = " ".join(f"{h.quantile(q) * 1000:>9.3f}" for q in QUANTILES)
+                lines.append(f"{label:<48} {h.count:>8} {stats.errors:>6} "
+                             f"{h.mean * 1000:>9.3f} {quantiles} {h.max * 1000:>9.3f}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def prometheus(self, buckets=PROMETHEUS_BUCKETS):
+        """Prometheus text exposition: histograms plus error counters."""
+        lines = []
+        for kind, label, table in (("function", "function", self.functions),
+                                   ("query", "query", self.queries)):
+            rows = self._snapshot(table)
+            if not rows:
+                continue
+            metric = f"db_{kind}_duration_seconds"
+            lines.append(f"# HELP {metric} Latency of decorated database {kind} calls.")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in rows:
+                h = stats.histogram
+                tag = f'{label}="{_escape(name)}"'
+                for bound, count in zip(buckets, h.cumulative(buckets)):
+                    lines.append(f'{metric}_bucket{{{tag},le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{{tag},le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum{{{tag}}} {h.total!r}")
+                lines.append(f"{metric}_count{{{tag}}} {h.count}")
+            errors = f"db_{kind}_errors_total"
+            lines.append(f"# HELP {errors} Failed decorated database {kind} calls.")
+            lines.append(f"# TYPE {errors} counter")
+            for name, stats in rows:
+                lines.append(f'{errors}{{{label}="{_escape(name)}"}} {stats.errors}')
+        return "\n".join(lines) + "\n"
+
+
+registry = ProfileRegistry()
+
+
+def get_registry():
+    """The module registry profile_queries records into by default."""
+    return registry
+
+
+_tracers = {}  # id(conn) -> [callback, ...] installed on conn
+
+
+@contextlib.contextmanager
+def _trace(conn, callback):
+    """Pass each statement `conn` runs in the block to `callback`."""
+    chain = _tracers.get(id(conn))
+    if chain is None:
+        chain = _tracers[id(conn)] = []
+
+        def trace(sql):
+            for call in chain:
+                call(sql)
+        conn.set_trace_callback(trace)
+    chain.append(callback)
+    try:
+        yield
+    finally:
+        chain.remove(callback)
+        if not chain:
+            del _tracers[id(conn)]
+            conn.set_trace_callback(None)
+
+
+def _query_getter(func, query_arg):
+    """(args, kwargs) -> the SQL passed as parameter `query_arg`, or None."""
+    if query_arg is None:
+        return lambda args, kwargs: None
+    try:
+        params = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        params = []
+    position = next((i for i, p in enumerate(params) if p.name == query_arg
+                     and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)),
+                    None)
+
+    def get(args, kwargs):
+        query = kwargs.get(query_arg)
+        if query is None and position is not None and position < len(args):
+            query = args[position]
+        return query if isinstance(query, str) else None
+    return get
+
+
+def _before_running(error):
+    """True if sqlite3 raised `error` before the statement started running."""
+    if isinstance(error, sqlite3.ProgrammingError):
+        return True
+    code = getattr(error, "sqlite_errorcode", None)
+    return code is not None and code & 0xFF == SQLITE_ERROR
+
+
+def _statement_timings(traced, ended, error):
+    """
+    [(normalized SQL, seconds, failed)] for the (sql, started) pairs in
+    `traced`: each runs until the next starts, the last until `ended`.
+    """
+    ends = [started for _, started in traced[1:]] + [ended]
+    timings = [[normalize_query(sql), end - started, False]
+               for (sql, started), end in zip(traced, ends)]
+    if isinstance(error, sqlite3.Error):
+        if timings and not _before_running(error):
+            timings[-1][2] = True
+        else:
+            timings.append([UNEXECUTED, 0.0, True])
+    return [tuple(timing) for timing in timings]
+
+
+def profile_queries(func=None, *, registry=None, query_arg="query"):
+    """
+    Decorator recording each call's latency and failure into `registry`
+    (the module registry by default). Usable bare or with arguments.
+
+    - query_arg: name of the parameter holding the SQL (None: never take
+      SQL from the arguments, always trace the connection)
+    """
+    def decorator(func):
+        name = func.__qualname__
+        explicit_query = _query_getter(func, query_arg)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = registry or get_registry()
+            query = explicit_query(args, kwargs)
+            traced = None
+            conn = args[0] if args else None
+            if query is None and isinstance(conn, sqlite3.Connection):
+                traced = []
+                tracing = _trace(
+                    conn, lambda sql: traced.append((sql, time.perf_counter())))
+            else:
+                tracing = contextlib.nullcontext()
+            error = None
+            started = time.perf_counter()
+            try:
+                with tracing:
+                    return func(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                ended = time.perf_counter()
+                elapsed = ended - started
+                if query is not None:
+                    queries = [(normalize_query(query), elapsed, error is not None)]
+                elif traced is not None:
+                    queries = _statement_timings(traced, ended, error)
+                else:
+                    queries = []
+                target.record(name, elapsed, error is not None, queries)
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+# Example usage
+if __name__ == "__main__":
+    fetch_all_users = profile_queries(__import__('0-log_queries').fetch_all_users)
+    connections = __import__('1-with_db_connection')
+    get_user_by_id = connections.with_db_connection(
+        profile_queries(connections.get_user_by_id.__wrapped__))
+
+    for _ in range(3):
+        fetch_all_users(query="SELECT * FROM users")
+    for user_id in range(1, 101):
+        get_user_by_id(user_id=user_id)
+    print(registry.report())
+    print(registry.prometheus())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-call overhead of with_db_connection (connect + close
+on every call) against with_pooled_connection for a point lookup.
+
+Builds a throwaway users.db with --rows users, then times --calls
+get_user_by_id-style lookups per decorator, on one thread and spread
+over --threads threads.
+
+Usage:
+    python bench_connections.py --calls 20000 --threads 4
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+connections = __import__('1-with_db_connection')
+
+
+def make_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                     ((i, f"User {i}", f"user{i}@example.com")
+                      for i in range(1, rows + 1)))
+    conn.commit()
+    conn.close()
+
+
+def lookup(conn, user_id):
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+    return cursor.fetchone()
+
+
+def run(func, calls, threads, rows):
+    """Seconds to make `calls` lookups split across `threads` threads."""
+    per_thread = calls // threads
+
+    def work(seed):
+        rng = random.Random(seed)
+        for _ in range(per_thread):
+            func(user_id=rng.randint(1, rows))
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - started, per_thread * threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connection overhead per call")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.db")
+        make_db(path, args.rows)
+        connections.DB_PATH = path
+        pool = connections.ConnectionPool(path, max_size=args.threads)
+        cases = [
+            ("with_db_connection", connections.with_db_connection(lookup)),
+            ("with_pooled_connection",
+             connections.with_pooled_connection(lookup, pool=pool)),
+        ]
+        print(f"{'decorator':>24} {'threads':>7} {'us/call':>9} {'calls/s':>10}")
+        for threads in sorted({1, args.threads}):
+            for name, func in cases:
+                elapsed, calls = run(func, args.calls, threads, args.rows)
+                print(f"{name:>24} {threads:>7} {elapsed / calls * 1e6:>9.1f} "
+                      f"{calls / elapsed:>10.0f}")
+        print(f"pool: {pool.stats()}")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: update_user_email committed per call against TransactionBatch
+at several batch sizes, on a throwaway users.db.
+
+Reports calls/s, commits and the speedup over per-call commits. Every
+commit is an fsync with the default journal, so run it on the disk you
+care about (--dir) rather than tmpfs.
+
+Usage:
+    python bench_transactions.py --calls 5000 --batch-sizes 10 100 1000
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+transactional = __import__('2-transactional')
+
+
+def make_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                     ((i, f"User {i}", f"user{i}@example.com")
+                      for i in range(1, rows + 1)))
+    conn.commit()
+    conn.close()
+
+
+def updates(calls, rows):
+    for i in range(calls):
+        user_id = i % rows + 1
+        transactional.update_user_email(user_id=user_id,
+                                        new_email=f"user{user_id}.{i}@example.com")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched transaction throughput")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--dir", default=None, help="where to create users.db")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        transactional.DB_PATH = os.path.join(tmp, "users.db")
+        make_db(transactional.DB_PATH, args.rows)
+
+        started = time.perf_counter()
+        updates(args.calls, args.rows)
+        baseline = args.calls / (time.perf_counter() - started)
+        print(f"{'mode':>16} {'calls/s':>10} {'commits':>8} {'speedup':>8}")
+        print(f"{'per-call commit':>16} {baseline:>10.0f} {args.calls:>8} {1.0:>7.1f}x")
+
+        for size in args.batch_sizes:
+            with transactional.TransactionBatch(max_calls=size) as batch:
+                updates(args.calls, args.rows)
+            stats = batch.stats()
+            print(f"{'batch ' + str(size):>16} {stats['calls_per_sec']:>10.0f} "
+                  f"{stats['commits']:>8} {stats['calls_per_sec'] / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for the 4-cache_query module.
+"""
+import asyncio
+import sqlite3
+import unittest
+
+cache_query = __import__('4-cache_query')
+
+
+class TestCacheKeys(unittest.TestCase):
+    """Tests that distinct queries get distinct cache entries."""
+
+    def test_without_connection(self) -> None:
+        """A cached function whose first argument is the SQL."""
+        @cache_query.cache_query(cache=cache_query.QueryCache())
+        def lookup(query):
+            return query
+
+        self.assertEqual(lookup("SELECT 1"), "SELECT 1")
+        self.assertEqual(lookup("SELECT 2"), "SELECT 2")
+        self.assertEqual(lookup("SELECT  1"), "SELECT 1")
+
+    def test_with_connection(self) -> None:
+        """The connection is left out of the key, the SQL is not."""
+        @cache_query.cache_query(cache=cache_query.QueryCache())
+        def fetch(conn, query):
+            return conn.execute(query).fetchall()
+
+        first = sqlite3.connect(":memory:")
+        second = sqlite3.connect(":memory:")
+        try:
+            self.assertEqual(fetch(first, "SELECT 1"), [(1,)])
+            self.assertEqual(fetch(first, "SELECT 2"), [(2,)])
+            self.assertEqual(fetch(second, "SELECT 1"), [(1,)])
+        finally:
+            first.close()
+            second.close()
+
+    def test_async_single_flight(self) -> None:
+        """Concurrent async calls with different SQL don't share results."""
+        @cache_query.cache_query(cache=cache_query.QueryCache(),
+                                 single_flight=True)
+        async def lookup(query):
+            await asyncio.sleep(0)
+            return query
+
+        async def run():
+            return await asyncio.gather(lookup("SELECT 1"), lookup("SELECT 2"))
+
+        self.assertEqual(asyncio.run(run()), ["SELECT 1", "SELECT 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
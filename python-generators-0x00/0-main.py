@@ -20,4 +20,5 @@ if connection:
         cursor.execute("SELECT * FROM user_data LIMIT 5;")
         rows = cursor.fetchall()
         print(rows)
-        cursor.close()
\ No newline at end of file
+        cursor.close()
+        connection.close()
\ No newline at end of file
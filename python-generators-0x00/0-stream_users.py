@@ -8,13 +8,18 @@ Prototype:
 Constraints:
     - Use Python's `yield`
     - No more than one loop
+
+Both generators use unbuffered cursors, so rows are read off the socket as
+they are consumed instead of the whole result set being pulled into client
+memory by execute(). stream_users_unbuffered additionally bounds the rows
+held client-side to a `prefetch` window via fetchmany().
 """
 
 from typing import Generator, Dict
-import mysql.connector
-from mysql.connector import Error
 import seed  # local module
 
+DEFAULT_PREFETCH = 1000
+
 
 def stream_users() -> Generator[Dict, None, None]:
     """
@@ -24,18 +29,55 @@ def stream_users() -> Generator[Dict, None, None]:
     if conn is None:
         raise RuntimeError("Could not connect to ALX_prodev database")
 
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor(dictionary=True, buffered=False)
     try:
         cursor.execute("SELECT user_id, name, email, age FROM user_data;")
         # Single loop yielding row-by-row
         for row in cursor:
             yield row
     finally:
-        try:
-            cursor.close()
-        except Exception:
-            pass
-        try:
-            conn.close()
-        except Exception:
-            pass
\ No newline at end of file
+        _close(cursor, conn)
+
+
+def stream_users_unbuffered(
+    prefetch: int = DEFAULT_PREFETCH,
+) -> Generator[Dict, None, None]:
+    """
+    Generator that yields rows from ALX_prodev.user_data as dictionaries,
+    keeping at most `prefetch` rows in client memory at any time.
+    """
+    if prefetch <= 0:
+        raise ValueError("prefetch must be > 0")
+
+    conn = seed.connect_to_prodev()
+    if conn is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute("SELECT user_id, name, email, age FROM user_data;")
+        while True:
+            window = cursor.fetchmany(size=prefetch)
+            if not window:
+                break
+            yield from window
+    finally:
+        _close(cursor, conn)
+
+
+def _close(cursor, conn) -> None:
+    """
+    Close cursor and connection, ignoring errors. If the consumer stopped
+    early, rows are still unread and cursor.close() raises "Unread result
+    found" (unless the connection was opened with consume_results), so the
+    rest of the result is not drained. Closing the connection then drops
+    it; a pooled connection with unread rows is discarded, not reused.
+    """
+    try:
+        cursor.close()
+    except Exception:
+        pass
+    try:
+        conn.close()
+    except Exception:
+        pass
\ No newline at end of file
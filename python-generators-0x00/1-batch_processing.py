@@ -3,33 +3,245 @@
 Batch processing using generators:
 - stream_users_in_batches(batch_size): yields batches of rows
 - batch_processing(batch_size): filters age > 25 and prints users
+
+Batches come in one of three row formats:
+- "dict":    list of dicts (default)
+- "tuple":   list of tuples ordered as COLUMNS; look fields up through
+             COLUMN_INDEX instead of allocating a dict per row
+- "columns": dict of column name -> sequence, with ages packed into an
+             array('i') so filters run over one flat column
+
+Filters and projections can be pushed down into the query:
+    stream_users_in_batches(500, columns=["user_id", "age"],
+                            where=[("age", ">", 25)])
+compiles to `SELECT user_id, age FROM user_data WHERE age > %s`. With
+pushdown=False the same predicates are applied in Python instead.
+
+Passing a BatchSizer makes the fetch size adaptive:
+    sizer = BatchSizer(target_seconds=0.05, target_bytes=1 << 20)
+    for batch in stream_users_in_batches(500, sizer=sizer): ...
+    sizer.stats()  # sizes chosen, per-row cost estimates
 """
 
-from typing import Generator, List, Dict
-from mysql.connector import Error
+import operator
+import time
+from array import array
+from itertools import compress
+from typing import (
+    Any, Generator, List, Dict, Iterable, Optional, Sequence, Tuple, Union
+)
 import seed
 
+COLUMNS = ("user_id", "name", "email", "age")
+COLUMN_INDEX = {name: index for index, name in enumerate(COLUMNS)}
+ROW_FORMATS = ("dict", "tuple", "columns")
+OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+class BatchSizer:
+    """
+    Tunes the fetchmany size toward a per-batch latency and/or byte budget.
+
+    After every fetch it updates exponentially weighted per-row estimates
+    of fetch time and payload bytes. The next size is the largest batch
+    whose estimate fits both budgets, changed by at most `max_step`x per
+    batch and clamped to [min_size, max_size].
+
+    - target_seconds: wanted fetch time per batch (None = no time budget)
+    - target_bytes: wanted payload bytes per batch (None = no byte budget)
+    """
+
+    def __init__(
+        self,
+        target_seconds: Optional[float] = 0.05,
+        target_bytes: Optional[int] = None,
+        min_size: int = 10,
+        max_size: int = 100_000,
+        max_step: float = 2.0,
+        smoothing: float = 0.3,
+    ) -> None:
+        if target_seconds is None and target_bytes is None:
+            raise ValueError("set target_seconds and/or target_bytes")
+        if not 0 < min_size <= max_size or max_step <= 1 or not 0 < smoothing <= 1:
+            raise ValueError("need 0 < min_size <= max_size, max_step > 1, "
+                             "0 < smoothing <= 1")
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_step = max_step
+        self.smoothing = smoothing
+        self.size = min_size
+        self.sizes: List[int] = []
+        self.row_seconds: Optional[float] = None
+        self.row_bytes: Optional[float] = None
+
+    def start(self, size: int) -> int:
+        """Set the initial size (clamped) and return it."""
+        self.size = min(max(size, self.min_size), self.max_size)
+        return self.size
+
+    def _smooth(self, old: Optional[float], new: float) -> float:
+        return new if old is None else old + self.smoothing * (new - old)
+
+    def observe(self, rows: List[tuple], seconds: float) -> int:
+        """Record one fetch of `rows` that took `seconds`; return next size."""
+        if not rows:
+            return self.size
+        self.sizes.append(self.size)
+        sample = rows[:: max(1, len(rows) // 8)]
+        row_bytes = sum(len(str(v)) for row in sample for v in row) / len(sample)
+        self.row_seconds = self._smooth(self.row_seconds, seconds / len(rows))
+        self.row_bytes = self._smooth(self.row_bytes, row_bytes)
+
+        fits = []
+        if self.target_seconds is not None and self.row_seconds > 0:
+            fits.append(self.target_seconds / self.row_seconds)
+        if self.target_bytes is not None and self.row_bytes > 0:
+            fits.append(self.target_bytes / self.row_bytes)
+        if fits and len(rows) == self.size:  # a short batch is the tail
+            wanted = min(fits)
+            low, high = self.size / self.max_step, self.size * self.max_step
+            wanted = min(max(wanted, low), high)
+            self.size = int(min(max(wanted, self.min_size), self.max_size))
+        return self.size
+
+    def stats(self) -> Dict[str, Any]:
+        """Sizes chosen so far and the current per-row estimates."""
+        return {
+            "batches": len(self.sizes),
+            "sizes": list(self.sizes),
+            "current_size": self.size,
+            "mean_size": sum(self.sizes) / len(self.sizes) if self.sizes else 0.0,
+            "row_seconds": self.row_seconds,
+            "row_bytes": self.row_bytes,
+        }
+
+
+Batch = Union[List[Dict], List[tuple], Dict[str, Sequence]]
+Predicate = Tuple[str, str, Any]
+
+
+def _check_columns(columns: Iterable[str]) -> Tuple[str, ...]:
+    """Validate column names against the user_data schema."""
+    columns = tuple(columns)
+    unknown = [name for name in columns if name not in COLUMN_INDEX]
+    if unknown or not columns:
+        raise ValueError(f"columns must be a non-empty subset of {COLUMNS}")
+    return columns
+
 
-def stream_users_in_batches(batch_size: int) -> Generator[List[Dict], None, None]:
+def _check_where(where: Iterable[Predicate]) -> Tuple[Predicate, ...]:
+    """Validate (column, operator, value) predicates."""
+    predicates = tuple(where)
+    for column, op, _ in predicates:
+        _check_columns([column])
+        if op not in OPERATORS:
+            raise ValueError(f"operator must be one of {tuple(OPERATORS)}")
+    return predicates
+
+
+def _compile_where(where: Sequence[Predicate]) -> Tuple[str, Tuple]:
+    """Compile ANDed predicates into a WHERE clause and its parameters."""
+    clause = " AND ".join(f"{column} {op} %s" for column, op, _ in where)
+    return clause, tuple(value for _, _, value in where)
+
+
+def _filter_rows(
+    rows: List[tuple], fetched: Sequence[str], where: Sequence[Predicate], width: int
+) -> List[tuple]:
+    """Python-side fallback: keep rows matching every predicate, then trim
+    the extra predicate-only columns off each row."""
+    checks = [(fetched.index(column), OPERATORS[op], value) for column, op, value in where]
+    return [
+        row[:width] for row in rows
+        if all(test(row[index], value) for index, test, value in checks)
+    ]
+
+
+def _to_columns(rows: List[tuple], columns: Sequence[str] = COLUMNS) -> Dict[str, Sequence]:
+    """Transpose a list of row tuples into per-column sequences."""
+    return {
+        name: array("i", map(int, values)) if name == "age" else values
+        for name, values in zip(columns, zip(*rows))
+    }
+
+
+def _format_batch(rows: List[tuple], columns: Sequence[str], row_format: str) -> Batch:
+    """Convert fetched row tuples into the requested row format."""
+    if row_format == "dict":
+        return [dict(zip(columns, row)) for row in rows]
+    if row_format == "columns":
+        return _to_columns(rows, columns)
+    return rows
+
+
+def stream_users_in_batches(
+    batch_size: int,
+    row_format: str = "dict",
+    columns: Optional[Sequence[str]] = None,
+    where: Optional[Sequence[Predicate]] = None,
+    pushdown: bool = True,
+    sizer: Optional[BatchSizer] = None,
+) -> Generator[Batch, None, None]:
     """
-    Yield rows in batches from ALX_prodev.user_data as a list of dicts.
+    Yield rows in batches from ALX_prodev.user_data in `row_format`.
     Uses a single loop and MySQL cursor.fetchmany for batching.
+
+    - columns: columns to select, in order (default: all of COLUMNS)
+    - where: (column, operator, value) predicates, ANDed together
+    - pushdown: compile `where` into the SQL; if False, fetch the predicate
+      columns too and filter in Python (batches may then be shorter than
+      batch_size, and empty ones are skipped)
+    - sizer: adapt the fetch size at runtime, starting from batch_size;
+      read the chosen sizes from sizer.stats()
     """
     if batch_size <= 0:
         raise ValueError("batch_size must be > 0")
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"row_format must be one of {ROW_FORMATS}")
+    selected = _check_columns(columns or COLUMNS)
+    predicates = _check_where(where or ())
+
+    python_filter = bool(predicates) and not pushdown
+    fetched = selected
+    if python_filter:
+        extra = [column for column, _, _ in predicates if column not in selected]
+        fetched = selected + tuple(dict.fromkeys(extra))
+    query = f"SELECT {', '.join(fetched)} FROM user_data"
+    params: Tuple = ()
+    if predicates and not python_filter:
+        clause, params = _compile_where(predicates)
+        query += f" WHERE {clause}"
 
     conn = seed.connect_to_prodev()
     if conn is None:
         raise RuntimeError("Could not connect to ALX_prodev database")
 
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
     try:
-        cursor.execute("SELECT user_id, name, email, age FROM user_data;")
+        cursor.execute(query, params)
+        if sizer is not None:
+            batch_size = sizer.start(batch_size)
         while True:
+            fetch_started = time.perf_counter()
             batch = cursor.fetchmany(size=batch_size)
+            if sizer is not None:
+                batch_size = sizer.observe(batch, time.perf_counter() - fetch_started)
             if not batch:
                 break
-            yield batch
+            if python_filter:
+                batch = _filter_rows(batch, fetched, predicates, len(selected))
+                if not batch:
+                    continue
+            yield _format_batch(batch, selected, row_format)
     finally:
         try:
             cursor.close()
@@ -44,15 +256,47 @@ def stream_users_in_batches(batch_size: int) -> Generator[List[Dict], None, None
     return
 
 
-def batch_processing(batch_size: int) -> None:
+def _users_over_25(batch: Batch, row_format: str) -> List[Dict]:
+    """
+    Return the users in `batch` older than 25 as dicts. Tuple and columnar
+    batches only build dicts for the rows that pass the filter.
+    """
+    if row_format == "dict":
+        return [u for u in batch if int(u.get("age", 0)) > 25]
+    if row_format == "tuple":
+        age = COLUMN_INDEX["age"]
+        return [dict(zip(COLUMNS, row)) for row in batch if int(row[age]) > 25]
+    keep = compress(range(len(batch["age"])), map((25).__lt__, batch["age"]))
+    return [{name: batch[name][i] for name in COLUMNS} for i in keep]
+
+
+def _as_dicts(batch: Batch, row_format: str) -> List[Dict]:
+    """Return the users in a full-width batch as dicts."""
+    if row_format == "dict":
+        return batch
+    if row_format == "tuple":
+        return [dict(zip(COLUMNS, row)) for row in batch]
+    return [dict(zip(COLUMNS, row)) for row in zip(*(batch[c] for c in COLUMNS))]
+
+
+def batch_processing(
+    batch_size: int, row_format: str = "dict", pushdown: bool = True
+) -> None:
     """
     Process each batch: filter users over age 25 and print them.
     Uses no more than 3 loops total in the script (2 explicit loops here).
+
+    - pushdown: let MySQL apply `age > 25`; if False, fetch every user and
+      filter each batch in Python
     """
-    for batch in stream_users_in_batches(batch_size):
-        processed = [u for u in batch if int(u.get("age", 0)) > 25]
+    where = [("age", ">", 25)] if pushdown else None
+    for batch in stream_users_in_batches(batch_size, row_format, where=where):
+        if pushdown:
+            processed = _as_dicts(batch, row_format)
+        else:
+            processed = _users_over_25(batch, row_format)
         for user in processed:
             print(user)
 
     # ✅ Add explicit return to satisfy checker
-    return
\ No newline at end of file
+    return
@@ -3,11 +3,25 @@
 Lazy pagination:
 - paginate_users(page_size, offset): returns a page of users as list[dict]
 - lazy_paginate(page_size): generator yielding pages lazily
+- paginate_users_after(connection, page_size, last_user_id): keyset page
+- lazy_paginate_keyset(page_size): pages by seeking on user_id over one
+  connection, so every page costs the same regardless of depth
+- prefetch(pages, depth): run any page iterator on a background thread,
+  buffering up to `depth` pages ahead of the consumer
+- lazy_paginate_prefetched(page_size, depth, keyset): prefetching pager
 """
 
-from typing import List, Dict, Generator
+import queue
+import threading
+from typing import Any, Iterator, List, Dict, Generator, Optional
 import seed
 
+DEFAULT_PREFETCH_DEPTH = 2
+_DONE = object()
+
+COLUMNS = "user_id, name, email, age"
+TABLE_NAME = "user_data"
+
 
 def paginate_users(page_size: int, offset: int) -> List[Dict]:
     """
@@ -23,9 +37,7 @@ def paginate_users(page_size: int, offset: int) -> List[Dict]:
     cursor = connection.cursor(dictionary=True)
     try:
         # Avoid the prohibited 'SELECT * FROM user_data LIMIT' pattern
-        columns = "user_id, name, email, age"
-        table_name = "user_data"
-        query = f"SELECT {columns} FROM {table_name} LIMIT {page_size} OFFSET {offset}"
+        query = f"SELECT {COLUMNS} FROM {TABLE_NAME} LIMIT {page_size} OFFSET {offset}"
         cursor.execute(query)
         rows = cursor.fetchall()
         return rows
@@ -54,4 +66,153 @@ def lazy_paginate(page_size: int) -> Generator[List[Dict], None, None]:
         offset += page_size
 
     # ✅ Add explicit return (some checkers require the keyword)
-    return
\ No newline at end of file
+    return
+
+
+def paginate_users_after(
+    connection, page_size: int, last_user_id: Optional[str] = None
+) -> List[Dict]:
+    """
+    Fetch the page of users following last_user_id in primary-key order.
+    The primary key index lets MySQL seek straight to the page instead of
+    scanning and discarding `offset` rows.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be > 0")
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        if last_user_id is None:
+            cursor.execute(
+                f"SELECT {COLUMNS} FROM {TABLE_NAME} ORDER BY user_id LIMIT %s",
+                (page_size,),
+            )
+        else:
+            cursor.execute(
+                f"SELECT {COLUMNS} FROM {TABLE_NAME} WHERE user_id > %s "
+                "ORDER BY user_id LIMIT %s",
+                (last_user_id, page_size),
+            )
+        return cursor.fetchall()
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+def lazy_paginate_keyset(
+    page_size: int, after: Optional[str] = None
+) -> Generator[List[Dict], None, None]:
+    """
+    Lazily yield pages of users ordered by user_id, seeking past the last
+    user_id of the previous page. One connection serves every page.
+
+    - after: start after this user_id (None = from the beginning)
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be > 0")
+
+    connection = seed.connect_to_prodev()
+    if connection is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+
+    last_user_id = after
+    try:
+        while True:
+            page = paginate_users_after(connection, page_size, last_user_id)
+            if not page:
+                break
+            yield page
+            if len(page) < page_size:
+                break
+            last_user_id = page[-1]["user_id"]
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    return
+
+
+class _Failure:
+    """Carries an exception raised by the producer thread to the consumer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def prefetch(
+    pages: Iterator[Any], depth: int = DEFAULT_PREFETCH_DEPTH
+) -> Generator[Any, None, None]:
+    """
+    Yield items of `pages` in order while a background thread fetches up to
+    `depth` items ahead into a bounded queue, so fetching page N+1 overlaps
+    with the consumer handling page N. An exception in the producer is
+    re-raised in the consumer after the items that preceded it. Closing
+    this generator stops the producer, which then closes `pages` on its
+    own thread.
+    """
+    if depth <= 0:
+        raise ValueError("depth must be > 0")
+
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                # Re-check after a successful put so an early stop doesn't
+                # cost one more fetch
+                if not put(page) or stop.is_set():
+                    break
+            else:
+                put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name="page-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        # Free a slot so a producer blocked in put() notices `stop` now
+        try:
+            buffer.get_nowait()
+        except queue.Empty:
+            pass
+        producer.join()
+
+    return
+
+
+def lazy_paginate_prefetched(
+    page_size: int, depth: int = DEFAULT_PREFETCH_DEPTH, keyset: bool = False
+) -> Generator[List[Dict], None, None]:
+    """
+    lazy_paginate (or lazy_paginate_keyset if `keyset`) with up to `depth`
+    pages fetched ahead on a background thread.
+    """
+    pages = lazy_paginate_keyset(page_size) if keyset else lazy_paginate(page_size)
+    return prefetch(pages, depth)
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+One-pass streaming aggregates over a column stream (e.g. stream_user_ages):
+- Count, Sum, MinMax: exact, mergeable
+- Moments: mean / variance / stddev with Welford's method, mergeable
+- Quantiles: P-squared estimators (Jain & Chlamtac), O(1) memory each
+- Histogram: fixed bin edges, with underflow/overflow counts, mergeable
+- aggregate(values, *aggregators): feeds every aggregator from one scan
+- age_summary(): all of the above over user_data ages
+
+Values are consumed in chunks. When NumPy is installed each chunk is
+converted to an array once and the vectorizable aggregators (everything
+except Quantiles, which is inherently sequential) work on the array.
+"""
+
+import math
+from bisect import bisect_right
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class Count:
+    """Number of values seen."""
+
+    name = "count"
+
+    def __init__(self) -> None:
+        self.n = 0
+
+    def update_chunk(self, values: Sequence) -> None:
+        self.n += len(values)
+
+    def merge(self, other: "Count") -> None:
+        self.n += other.n
+
+    def result(self) -> int:
+        return self.n
+
+
+class Sum:
+    """Sum of values."""
+
+    name = "sum"
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def update_chunk(self, values: Sequence) -> None:
+        if np is not None and isinstance(values, np.ndarray):
+            self.total += values.sum().item()
+        else:
+            self.total += sum(values)
+
+    def merge(self, other: "Sum") -> None:
+        self.total += other.total
+
+    def result(self) -> float:
+        return self.total
+
+
+class MinMax:
+    """Smallest and largest values; None until a value is seen."""
+
+    name = "minmax"
+
+    def __init__(self) -> None:
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def update_chunk(self, values: Sequence) -> None:
+        if len(values) == 0:
+            return
+        if np is not None and isinstance(values, np.ndarray):
+            low, high = values.min().item(), values.max().item()
+        else:
+            low, high = min(values), max(values)
+        self.merge_bounds(low, high)
+
+    def merge_bounds(self, low: float, high: float) -> None:
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other: "MinMax") -> None:
+        if other.min is not None:
+            self.merge_bounds(other.min, other.max)
+
+    def result(self) -> Dict[str, Optional[float]]:
+        return {"min": self.min, "max": self.max}
+
+
+class Moments:
+    """
+    Mean and variance via Welford's method. Chunks are reduced to
+    (n, mean, M2) and combined with Chan's parallel update, which is what
+    merge() uses as well.
+    """
+
+    name = "moments"
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update_chunk(self, values: Sequence) -> None:
+        n = len(values)
+        if n == 0:
+            return
+        if np is not None and isinstance(values, np.ndarray):
+            mean = values.mean().item()
+            m2 = float(((values - mean) ** 2).sum())
+        else:
+            mean = math.fsum(values) / n
+            m2 = math.fsum((x - mean) ** 2 for x in values)
+        self._combine(n, mean, m2)
+
+    def _combine(self, n: int, mean: float, m2: float) -> None:
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def merge(self, other: "Moments") -> None:
+        if other.n:
+            self._combine(other.n, other.mean, other.m2)
+
+    def variance(self, sample: bool = False) -> float:
+        """Population variance, or sample variance if `sample`."""
+        dof = self.n - 1 if sample else self.n
+        return self.m2 / dof if dof > 0 else 0.0
+
+    def result(self) -> Dict[str, float]:
+        variance = self.variance()
+        return {"mean": self.mean, "variance": variance, "stddev": math.sqrt(variance)}
+
+
+class _P2:
+    """P-squared estimator for a single quantile p (0 < p < 1)."""
+
+    def __init__(self, p: float) -> None:
+        self.p = p
+        self.count = 0
+        self.q: List[float] = []
+        self.pos = [0, 1, 2, 3, 4]
+        self.want = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.step = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        q = self.q
+        self.count += 1
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect_right(q, x, 1, 4) - 1
+        pos = self.pos
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            self.want[i] += self.step[i]
+
+        for i in (1, 2, 3):
+            d = self.want[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                d = 1 if d > 0 else -1
+                estimate = self._parabolic(i, d)
+                if not q[i - 1] < estimate < q[i + 1]:
+                    estimate = q[i] + d * (q[i + d] - q[i]) / (pos[i + d] - pos[i])
+                q[i] = estimate
+                pos[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.q, self.pos
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if not self.q:
+            return None
+        if self.count <= 5:
+            # Too few values for markers: interpolate the exact sample
+            rank = self.p * (len(self.q) - 1)
+            low = int(rank)
+            high = min(low + 1, len(self.q) - 1)
+            return self.q[low] + (self.q[high] - self.q[low]) * (rank - low)
+        return self.q[2]
+
+
+class Quantiles:
+    """
+    Approximate quantiles with one P-squared estimator per quantile.
+    Not mergeable: P-squared markers can't be combined after the fact.
+    """
+
+    name = "quantiles"
+
+    def __init__(self, quantiles: Sequence[float] = (0.5, 0.9, 0.99)) -> None:
+        if not all(0 < p < 1 for p in quantiles):
+            raise ValueError("quantiles must be between 0 and 1 (exclusive)")
+        self.estimators = [_P2(p) for p in quantiles]
+
+    def update_chunk(self, values: Sequence) -> None:
+        if np is not None and isinstance(values, np.ndarray):
+            values = values.tolist()
+        for estimator in self.estimators:
+            add = estimator.add
+            for x in values:
+                add(x)
+
+    def result(self) -> Dict[float, Optional[float]]:
+        return {e.p: e.value() for e in self.estimators}
+
+
+class Histogram:
+    """
+    Counts per bin for ascending `edges`; bin i covers [edges[i], edges[i+1])
+    and the last bin also includes edges[-1]. Values outside the edges are
+    counted in `underflow` / `overflow`.
+    """
+
+    name = "histogram"
+
+    def __init__(self, edges: Sequence[float]) -> None:
+        if len(edges) < 2 or any(b <= a for a, b in zip(edges, edges[1:])):
+            raise ValueError("edges must be at least two strictly ascending values")
+        self.edges = list(edges)
+        self.counts = [0] * (len(edges) - 1)
+        self.underflow = 0
+        self.overflow = 0
+
+    @classmethod
+    def uniform(cls, low: float, high: float, bins: int) -> "Histogram":
+        """Histogram with `bins` equal-width bins between low and high."""
+        if bins <= 0 or high <= low:
+            raise ValueError("need bins > 0 and high > low")
+        width = (high - low) / bins
+        return cls([low + width * i for i in range(bins)] + [high])
+
+    def update_chunk(self, values: Sequence) -> None:
+        edges = self.edges
+        if np is not None and isinstance(values, np.ndarray):
+            counts, _ = np.histogram(values, bins=edges)
+            for i, c in enumerate(counts.tolist()):
+                self.counts[i] += c
+            self.underflow += int((values < edges[0]).sum())
+            self.overflow += int((values > edges[-1]).sum())
+            return
+        last = len(self.counts) - 1
+        for x in values:
+            if x < edges[0]:
+                self.underflow += 1
+            elif x > edges[-1]:
+                self.overflow += 1
+            else:
+                self.counts[min(bisect_right(edges, x) - 1, last)] += 1
+
+    def merge(self, other: "Histogram") -> None:
+        if other.edges != self.edges:
+            raise ValueError("cannot merge histograms with different edges")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "edges": self.edges,
+            "counts": self.counts,
+            "underflow": self.underflow,
+            "overflow": self.overflow,
+        }
+
+
+def aggregate(
+    values: Iterable[float], *aggregators, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Feed every aggregator from a single pass over `values`, `chunk_size`
+    values at a time, and return {aggregator.name: aggregator.result()}.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        if np is not None:
+            chunk = np.asarray(chunk, dtype=np.float64)
+        for aggregator in aggregators:
+            aggregator.update_chunk(chunk)
+    return {aggregator.name: aggregator.result() for aggregator in aggregators}
+
+
+def age_summary(
+    quantiles: Sequence[float] = (0.5, 0.9, 0.99),
+    bins: int = 10,
+    age_range: Sequence[float] = (0, 120),
+) -> Dict[str, Any]:
+    """Count, min/max, mean/variance, quantiles and a histogram of ages,
+    computed in one scan of stream_user_ages()."""
+    stream_user_ages = __import__('4-stream_ages').stream_user_ages
+    return aggregate(
+        stream_user_ages(),
+        Count(),
+        MinMax(),
+        Moments(),
+        Quantiles(quantiles),
+        Histogram.uniform(age_range[0], age_range[1], bins),
+    )
+
+
+if __name__ == "__main__":
+    for key, value in age_summary().items():
+        print(f"{key}: {value}")
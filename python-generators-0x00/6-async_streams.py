@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Asyncio counterparts of the streaming generators:
+- async_stream_users(chunk_size): async generator of user dicts
+- async_stream_users_in_batches(batch_size, ...): async generator of batches
+- async_lazy_paginate(page_size, keyset): async generator of pages
+- async_stream_user_ages(chunk_size): async generator of ages
+- async_average_age(): average age without blocking the event loop
+
+Each one drives the matching blocking generator on a dedicated worker
+thread, so mysql.connector never runs on the event loop. While the
+consumer handles one item, the next one is already being fetched
+(one-deep read-ahead), overlapping database latency with processing.
+Per-row streams hop threads once per `chunk_size` rows, not per row.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
+
+stream_users = __import__('0-stream_users').stream_users
+stream_users_in_batches = __import__('1-batch_processing').stream_users_in_batches
+paginate = __import__('2-lazy_paginate')
+stream_user_ages = __import__('4-stream_ages').stream_user_ages
+
+DEFAULT_CHUNK_SIZE = 1000
+_DONE = object()
+
+
+async def _read_ahead(
+    gen: Generator, chunk_size: Optional[int] = None
+) -> AsyncGenerator[Any, None]:
+    """
+    Iterate a blocking generator from asyncio with the next fetch already
+    running on the generator's worker thread.
+
+    - chunk_size: None fetches one item per thread hop (batches, pages);
+      otherwise `chunk_size` items are fetched per hop and yielded singly
+
+    All calls into `gen` go through one single-thread executor, so they
+    never overlap, and the final close() runs only after any in-flight
+    fetch has finished.
+    """
+    if chunk_size is None:
+        fetch = lambda: [next(gen, _DONE)]  # noqa: E731
+    elif chunk_size > 0:
+        fetch = lambda: list(islice(gen, chunk_size)) or [_DONE]  # noqa: E731
+    else:
+        raise ValueError("chunk_size must be > 0")
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream")
+    pending = loop.run_in_executor(executor, fetch)
+    try:
+        while True:
+            items = await pending
+            if items[-1] is _DONE:
+                break
+            pending = loop.run_in_executor(executor, fetch)
+            for item in items:
+                yield item
+    finally:
+        pending.cancel()
+        await loop.run_in_executor(executor, gen.close)
+        executor.shutdown(wait=False)
+
+
+def async_stream_users(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncGenerator[Dict, None]:
+    """Async generator yielding user_data rows as dictionaries."""
+    return _read_ahead(stream_users(), chunk_size)
+
+
+def async_stream_users_in_batches(
+    batch_size: int, **options
+) -> AsyncGenerator[Any, None]:
+    """
+    Async generator yielding batches; `options` (row_format, columns,
+    where, pushdown) are passed to stream_users_in_batches.
+    """
+    return _read_ahead(stream_users_in_batches(batch_size, **options))
+
+
+def async_lazy_paginate(
+    page_size: int, keyset: bool = True, after: Optional[str] = None
+) -> AsyncGenerator[List[Dict], None]:
+    """
+    Async generator yielding pages of users. Uses keyset pagination over
+    one connection by default; keyset=False pages with LIMIT/OFFSET.
+    """
+    if keyset:
+        return _read_ahead(paginate.lazy_paginate_keyset(page_size, after))
+    return _read_ahead(paginate.lazy_paginate(page_size))
+
+
+def async_stream_user_ages(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncGenerator[int, None]:
+    """Async generator yielding user ages one by one."""
+    return _read_ahead(stream_user_ages(), chunk_size)
+
+
+async def async_average_age() -> float:
+    """Compute and print the average age from the async age stream."""
+    count = 0
+    total = 0
+    async for age in async_stream_user_ages():
+        total += age
+        count += 1
+
+    avg = (total / count) if count else 0.0
+    print(f"Average age of users: {avg:.2f}")
+    return avg
+
+
+if __name__ == "__main__":
+    asyncio.run(async_average_age())
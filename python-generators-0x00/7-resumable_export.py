@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Resumable export of ALX_prodev.user_data to NDJSON or CSV:
+- export_users(output, checkpoint, fmt): stream user_data to `output`,
+  checkpointing progress so a rerun continues where the last one stopped
+
+Rows are read with keyset pagination (lazy_paginate_keyset) in user_id
+order and written in large buffered chunks. After each chunk is flushed
+and fsynced, the checkpoint file records the last user_id written and
+the output size at that point. On restart the output is truncated back
+to that size (dropping any partial chunk written after the checkpoint)
+and the export seeks past the checkpointed user_id, so no rows are read
+twice and none are duplicated in the output. A checkpoint whose output
+file is missing or shorter than recorded is stale, and the export starts
+over; one written in a different format is refused.
+
+Usage:
+    python 7-resumable_export.py users.ndjson
+    python 7-resumable_export.py users.csv --format csv --page-size 5000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+paginate = __import__('2-lazy_paginate')
+
+COLUMNS = ("user_id", "name", "email", "age")
+FORMATS = ("ndjson", "csv")
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_CHUNK_ROWS = 10000
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Read a checkpoint file; a missing file means a fresh export."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"last_user_id": None, "rows": 0, "output_bytes": 0}
+
+
+def _resume_state(checkpoint: str, output: str, fmt: str) -> Dict[str, Any]:
+    """
+    Load the checkpoint and check it still describes `output`. A format
+    mismatch raises ValueError; a missing or truncated output file means
+    the checkpoint is stale, so the export restarts from scratch.
+    """
+    state = load_checkpoint(checkpoint)
+    if state.get("fmt", fmt) != fmt:
+        raise ValueError(f"{checkpoint} records a {state['fmt']!r} export, "
+                         f"not {fmt!r}; remove it to start over")
+    if state["output_bytes"]:
+        try:
+            size = os.path.getsize(output)
+        except FileNotFoundError:
+            size = -1
+        if size < state["output_bytes"]:
+            print(f"Ignoring stale checkpoint {checkpoint}: {output} is "
+                  f"missing or shorter than {state['output_bytes']} bytes")
+            state = {"last_user_id": None, "rows": 0, "output_bytes": 0}
+    state["fmt"] = fmt
+    return state
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Atomically replace the checkpoint file with `state`."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _encode(rows: List[Dict], fmt: str) -> str:
+    """Serialize rows as NDJSON lines or CSV records."""
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps({**row, "age": int(row["age"])}, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([row[c] if c != "age" else int(row[c]) for c in COLUMNS]
+                     for row in rows)
+    return buffer.getvalue()
+
+
+def export_users(
+    output: str,
+    checkpoint: Optional[str] = None,
+    fmt: str = "ndjson",
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Dict[str, Any]:
+    """
+    Export user_data to `output`, resuming from `checkpoint` if present.
+
+    - checkpoint: checkpoint path (default: `output` + ".ckpt")
+    - fmt: "ndjson" or "csv" (CSV gets a header on a fresh export)
+    - page_size: rows per keyset page read from MySQL
+    - chunk_rows: rows buffered per write + fsync + checkpoint
+
+    Returns stats: rows (this run), total_rows, resumed_after, seconds.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}")
+    if page_size <= 0 or chunk_rows <= 0:
+        raise ValueError("page_size and chunk_rows must be > 0")
+    checkpoint = checkpoint or f"{output}.ckpt"
+    state = _resume_state(checkpoint, output, fmt)
+    resumed_after = state["last_user_id"]
+
+    started = time.perf_counter()
+    written = 0
+    mode = "r+b" if os.path.exists(output) else "wb"
+    with open(output, mode) as f:
+        # Drop anything written after the last checkpoint
+        f.truncate(state["output_bytes"])
+        f.seek(state["output_bytes"])
+        if fmt == "csv" and state["output_bytes"] == 0:
+            f.write((",".join(COLUMNS) + "\n").encode("utf-8"))
+
+        pending: List[Dict] = []
+
+        def flush() -> None:
+            nonlocal pending, written
+            if not pending:
+                return
+            f.write(_encode(pending, fmt).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            written += len(pending)
+            state["last_user_id"] = pending[-1]["user_id"]
+            state["rows"] += len(pending)
+            state["output_bytes"] = f.tell()
+            save_checkpoint(checkpoint, state)
+            pending = []
+
+        for page in paginate.lazy_paginate_keyset(page_size, after=resumed_after):
+            pending.extend(page)
+            if len(pending) >= chunk_rows:
+                flush()
+        flush()
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "rows": written,
+        "total_rows": state["rows"],
+        "resumed_after": resumed_after,
+        "seconds": elapsed,
+    }
+    print(f"Exported {written} row(s) to {output} in {elapsed:.2f}s "
+          f"({state['rows']} total)")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resumable user_data export")
+    parser.add_argument("output")
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+    export_users(args.output, args.checkpoint, args.format,
+                 args.page_size, args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Columnar export of ALX_prodev.user_data for local analytic scans:
+- write_columnar(path): stream user_data into a compressed columnar file
+- ColumnarReader(path): memory-maps the file and decodes single columns
+- average_age(path): average age computed from the file, not MySQL
+
+File layout (Parquet-style, without the pyarrow dependency):
+
+    MAGIC | row group 0 column chunks | row group 1 ... | footer | len | MAGIC
+
+Each row group is one batch from stream_users_in_batches(..., "columns"),
+so the writer holds a single batch in memory. Each column of a row group
+is stored as its own zlib-compressed chunk: `age` as packed int32 values,
+string columns as uint32 end offsets followed by the UTF-8 data. The JSON
+footer records the schema and every chunk's offset and length, so a scan
+of one column decompresses only that column's chunks.
+
+Usage:
+    python 8-columnar_export.py user_data.ucol       # export, then average
+"""
+
+import json
+import mmap
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+COLUMNS = ("user_id", "name", "email", "age")
+TYPES = {"user_id": "utf8", "name": "utf8", "email": "utf8", "age": "int32"}
+MAGIC = b"UCOL1\0"
+CODECS = ("zlib", "none")
+DEFAULT_BATCH_SIZE = 10000
+_FOOTER_LEN = struct.Struct("<Q")
+
+
+def _encode_column(values: Sequence, kind: str) -> bytes:
+    """Pack one column of a batch into bytes."""
+    if kind == "int32":
+        return array("i", values).tobytes()
+    data = [str(value).encode("utf-8") for value in values]
+    ends = array("I")
+    total = 0
+    for item in data:
+        total += len(item)
+        ends.append(total)
+    return ends.tobytes() + b"".join(data)
+
+
+def _decode_column(payload: bytes, kind: str, rows: int, swap: bool) -> Sequence:
+    """Unpack bytes written by _encode_column."""
+    if kind == "int32":
+        values = array("i")
+        values.frombytes(payload)
+        if swap:
+            values.byteswap()
+        return values
+    ends = array("I")
+    ends.frombytes(payload[:rows * ends.itemsize])
+    if swap:
+        ends.byteswap()
+    data = payload[rows * ends.itemsize:]
+    start = 0
+    strings = []
+    for end in ends:
+        strings.append(data[start:end].decode("utf-8"))
+        start = end
+    return strings
+
+
+def write_columnar(
+    path: str,
+    batches: Optional[Iterable[Dict[str, Sequence]]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    codec: str = "zlib",
+    level: int = 6,
+) -> Dict[str, Any]:
+    """
+    Write columnar batches to `path`, one row group per batch.
+
+    - batches: dicts of column -> values (default: user_data streamed via
+      stream_users_in_batches(batch_size, "columns"))
+    - codec: "zlib" or "none"; level: zlib compression level
+
+    Returns stats: rows, row_groups, bytes, seconds.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"codec must be one of {CODECS}")
+    if batches is None:
+        processing = __import__('1-batch_processing')
+        batches = processing.stream_users_in_batches(batch_size, "columns")
+
+    started = time.perf_counter()
+    row_groups: List[Dict[str, Any]] = []
+    rows = 0
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for batch in batches:
+            count = len(batch["age"])
+            chunks = {}
+            for name in COLUMNS:
+                payload = _encode_column(batch[name], TYPES[name])
+                if codec == "zlib":
+                    payload = zlib.compress(payload, level)
+                chunks[name] = {"offset": f.tell(), "length": len(payload)}
+                f.write(payload)
+            row_groups.append({"rows": count, "columns": chunks})
+            rows += count
+
+        footer = json.dumps({
+            "version": 1,
+            "codec": codec,
+            "byteorder": sys.byteorder,
+            "columns": [{"name": n, "type": TYPES[n]} for n in COLUMNS],
+            "rows": rows,
+            "row_groups": row_groups,
+        }).encode("utf-8")
+        f.write(footer)
+        f.write(_FOOTER_LEN.pack(len(footer)))
+        f.write(MAGIC)
+        size = f.tell()
+
+    elapsed = time.perf_counter() - started
+    return {"rows": rows, "row_groups": len(row_groups), "bytes": size,
+            "seconds": elapsed}
+
+
+class ColumnarReader:
+    """
+    Memory-mapped reader for files written by write_columnar. Column chunks
+    are decompressed straight out of the mapping, one row group at a time.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        tail = len(MAGIC) + _FOOTER_LEN.size
+        if self._map[:len(MAGIC)] != MAGIC or self._map[-len(MAGIC):] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a columnar user_data file")
+        (footer_len,) = _FOOTER_LEN.unpack(self._map[-tail:-len(MAGIC)])
+        footer_start = len(self._map) - tail - footer_len
+        self.meta = json.loads(self._map[footer_start:-tail])
+        self.types = {c["name"]: c["type"] for c in self.meta["columns"]}
+        self._swap = self.meta["byteorder"] != sys.byteorder
+
+    @property
+    def rows(self) -> int:
+        return self.meta["rows"]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.types)
+
+    def _chunk(self, group: Dict[str, Any], name: str) -> Sequence:
+        where = group["columns"][name]
+        with memoryview(self._map)[where["offset"]:where["offset"] + where["length"]] as view:
+            payload = zlib.decompress(view) if self.meta["codec"] == "zlib" else bytes(view)
+        return _decode_column(payload, self.types[name], group["rows"], self._swap)
+
+    def iter_column(self, name: str) -> Iterator[Sequence]:
+        """Yield `name` one row group at a time (array('i') or list of str)."""
+        if name not in self.types:
+            raise KeyError(name)
+        for group in self.meta["row_groups"]:
+            yield self._chunk(group, name)
+
+    def iter_batches(
+        self, columns: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, Sequence]]:
+        """Yield dicts of the selected columns, one row group at a time."""
+        names = list(columns or self.types)
+        for group in self.meta["row_groups"]:
+            yield {name: self._chunk(group, name) for name in names}
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "ColumnarReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def average_age(path: str) -> float:
+    """Compute and print the average age from a columnar export."""
+    count = 0
+    total = 0
+    with ColumnarReader(path) as reader:
+        for ages in reader.iter_column("age"):
+            total += sum(ages)
+            count += len(ages)
+
+    avg = (total / count) if count else 0.0
+    print(f"Average age of users: {avg:.2f}")
+    return avg
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "user_data.ucol"
+    stats = write_columnar(target)
+    print(f"Wrote {stats['rows']} row(s) in {stats['row_groups']} row group(s), "
+          f"{stats['bytes']} bytes, {stats['seconds']:.2f}s")
+    average_age(target)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Parallel range-partitioned scans of ALX_prodev.user_data:
+- key_ranges(parts): split user_data into `parts` user_id ranges of
+  roughly equal row counts
+- parallel_scan(map_fn, reduce_fn, initial): stream every range on its
+  own connection in a process pool, map each fetched batch to a partial
+  result, and reduce partials within and across workers
+- parallel_average_age(workers): average age from per-range sum/count
+- parallel_count_over(age, workers): users older than `age`
+
+map_fn and reduce_fn run in worker processes, so they must be picklable
+(module-level functions). The active seed backend is handed to every
+worker, so SEED_BACKEND/set_backend choices carry over.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import seed
+
+COLUMNS = ("user_id", "name", "email", "age")
+DEFAULT_BATCH_SIZE = 5000
+
+KeyRange = Tuple[Optional[str], Optional[str]]
+
+
+def key_ranges(parts: int) -> List[KeyRange]:
+    """
+    Split user_data into `parts` ranges (low, high] of user_id with about
+    the same number of rows each. None means unbounded. Boundaries are
+    read from the primary key index, once, before the scan.
+    """
+    if parts <= 0:
+        raise ValueError("parts must be > 0")
+    conn = seed.connect_to_prodev()
+    if conn is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_data;")
+        (total,) = cursor.fetchone()
+        total = int(total)
+        parts = min(parts, max(total, 1))
+        bounds: List[Optional[str]] = [None]
+        for part in range(1, parts):
+            cursor.execute(
+                "SELECT user_id FROM user_data ORDER BY user_id LIMIT 1 OFFSET %s;",
+                (total * part // parts - 1,),
+            )
+            row = cursor.fetchone()
+            if row is not None and row[0] != bounds[-1]:
+                bounds.append(row[0])
+        bounds.append(None)
+    finally:
+        cursor.close()
+        conn.close()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _range_query(columns: Sequence[str], key_range: KeyRange) -> Tuple[str, Tuple]:
+    low, high = key_range
+    conditions, params = [], []
+    if low is not None:
+        conditions.append("user_id > %s")
+        params.append(low)
+    if high is not None:
+        conditions.append("user_id <= %s")
+        params.append(high)
+    query = f"SELECT {', '.join(columns)} FROM user_data"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return query + ";", tuple(params)
+
+
+def _scan_range(task) -> Any:
+    """Worker: stream one key range and fold its batches into a partial."""
+    key_range, columns, map_fn, reduce_fn, initial, batch_size = task
+    conn = seed.connect_to_prodev()
+    if conn is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+    cursor = conn.cursor()
+    partial = initial
+    try:
+        cursor.execute(*_range_query(columns, key_range))
+        while True:
+            batch = cursor.fetchmany(size=batch_size)
+            if not batch:
+                break
+            partial = reduce_fn(partial, map_fn(batch))
+    finally:
+        cursor.close()
+        conn.close()
+    return partial
+
+
+def parallel_scan(
+    map_fn: Callable[[List[tuple]], Any],
+    reduce_fn: Callable[[Any, Any], Any],
+    initial: Any,
+    columns: Sequence[str] = COLUMNS,
+    workers: Optional[int] = None,
+    parts: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Any:
+    """
+    Scan user_data in parallel and return the reduced result.
+
+    - map_fn(rows) -> partial: applied to each fetched batch of row tuples
+      (ordered as `columns`); filter inside it
+    - reduce_fn(a, b) -> partial: associative merge of two partials
+    - initial: identity partial for reduce_fn
+    - workers: processes (default: os.cpu_count())
+    - parts: key ranges (default: workers); more parts than workers
+      evens out ranges that stream at different speeds
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be > 0")
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown or not columns:
+        raise ValueError(f"columns must be a non-empty subset of {COLUMNS}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError("workers must be >= 1")
+    if parts is None:
+        parts = workers
+    elif parts < 1:
+        raise ValueError("parts must be >= 1")
+    ranges = key_ranges(parts)
+    tasks = [(r, tuple(columns), map_fn, reduce_fn, initial, batch_size)
+             for r in ranges]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        initializer=seed.set_backend,
+        initargs=(seed.get_backend(),),
+    ) as pool:
+        partials = list(pool.map(_scan_range, tasks))
+    return reduce(reduce_fn, partials, initial)
+
+
+def _sum_count(rows: List[tuple]) -> Tuple[int, int]:
+    return sum(int(age) for (age,) in rows), len(rows)
+
+
+def _add_pairs(a: Tuple[int, int], b: Tuple[int, int]) -> Tuple[int, int]:
+    return a[0] + b[0], a[1] + b[1]
+
+
+def parallel_average_age(workers: Optional[int] = None) -> float:
+    """Compute and print the average age with a parallel scan."""
+    total, count = parallel_scan(_sum_count, _add_pairs, (0, 0),
+                                 columns=("age",), workers=workers)
+    avg = (total / count) if count else 0.0
+    print(f"Average age of users: {avg:.2f}")
+    return avg
+
+
+class _CountOver:
+    """Picklable map_fn counting rows with age above a threshold."""
+
+    def __init__(self, age: int) -> None:
+        self.age = age
+
+    def __call__(self, rows: List[tuple]) -> int:
+        return sum(1 for (age,) in rows if int(age) > self.age)
+
+
+def _add(a: int, b: int) -> int:
+    return a + b
+
+
+def parallel_count_over(age: int = 25, workers: Optional[int] = None) -> int:
+    """Number of users older than `age`, counted with a parallel scan."""
+    return parallel_scan(_CountOver(age), _add, 0, columns=("age",),
+                         workers=workers)
+
+
+if __name__ == "__main__":
+    parallel_average_age()
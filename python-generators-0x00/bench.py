@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the streaming strategies.
+
+Seeds user_data with synthetic rows up to --rows, then runs every
+strategy x batch size in its own subprocess (so peak RSS is per run) and
+reports, for each run:
+
+- rows, seconds, rows_per_sec
+- first_row_s: time until the first row (or batch) arrived
+- peak_rss_mb: peak resident memory of the run
+- round_trips: statements executed; connects: connections opened
+
+Results are printed as a table on stderr and written as JSON lines (one
+object per run) to --output, or stdout, for tracking regressions.
+
+Usage:
+    SEED_BACKEND=sqlite python bench.py --rows 100000 --batch-sizes 100 1000
+    python bench.py --rows 1000000 --strategies stream_users keyset \\
+        --output results.jsonl
+
+The offset strategy re-scans skipped rows on every page (quadratic), so
+leave it out of runs with millions of rows.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, Iterator
+
+import seed
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+STRATEGIES = (
+    "stream_users",
+    "stream_users_unbuffered",
+    "batches_dict",
+    "batches_tuple",
+    "batches_columns",
+    "offset",
+    "keyset",
+    "keyset_prefetched",
+    "stream_user_ages",
+)
+# Strategies that ignore the batch size run once
+UNBATCHED = ("stream_users", "stream_user_ages")
+
+
+def _module(name: str):
+    return __import__(name)
+
+
+def strategy_items(name: str, batch_size: int) -> Iterator[Any]:
+    """
+    Iterator over what strategy `name` yields: rows for row streams, lists
+    or column dicts for batch streams.
+    """
+    if name == "stream_users":
+        return _module('0-stream_users').stream_users()
+    if name == "stream_users_unbuffered":
+        return _module('0-stream_users').stream_users_unbuffered(batch_size)
+    if name.startswith("batches_"):
+        row_format = name.split("_", 1)[1]
+        processing = _module('1-batch_processing')
+        return processing.stream_users_in_batches(batch_size, row_format)
+    paginate = _module('2-lazy_paginate')
+    if name == "offset":
+        return paginate.lazy_paginate(batch_size)
+    if name == "keyset":
+        return paginate.lazy_paginate_keyset(batch_size)
+    if name == "keyset_prefetched":
+        return paginate.lazy_paginate_prefetched(batch_size, keyset=True)
+    if name == "stream_user_ages":
+        return _module('4-stream_ages').stream_user_ages()
+    raise ValueError(f"unknown strategy {name}")
+
+
+def item_rows(item: Any) -> int:
+    """Rows carried by one yielded item."""
+    if isinstance(item, list):
+        return len(item)
+    if isinstance(item, dict) and hasattr(item.get("age"), "__len__"):
+        return len(item["age"])  # columnar batch
+    return 1
+
+
+class CountingBackend:
+    """Wraps a seed backend, counting connections and statements."""
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+        self.name = backend.name
+        self.connects = 0
+        self.statements = 0
+
+    def _wrap(self, conn):
+        counter = self
+
+        class Cursor:
+            def __init__(self, raw):
+                self._raw = raw
+
+            def execute(self, *args, **kwargs):
+                counter.statements += 1
+                return self._raw.execute(*args, **kwargs)
+
+            def __iter__(self):
+                return iter(self._raw)
+
+            def __getattr__(self, name):
+                return getattr(self._raw, name)
+
+        class Connection:
+            def __init__(self, raw):
+                self._raw = raw
+
+            def cursor(self, *args, **kwargs):
+                return Cursor(self._raw.cursor(*args, **kwargs))
+
+            def __getattr__(self, name):
+                return getattr(self._raw, name)
+
+        self.connects += 1
+        return Connection(conn)
+
+    def connect_server(self):
+        return self._wrap(self.backend.connect_server())
+
+    def connect(self, **options):
+        return self._wrap(self.backend.connect(**options))
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_one(strategy: str, batch_size: int) -> Dict[str, Any]:
+    """Run one strategy to exhaustion in this process and measure it."""
+    counting = CountingBackend(seed.get_backend())
+    seed.set_backend(counting)
+    rows = 0
+    first_row = None
+    started = time.perf_counter()
+    for item in strategy_items(strategy, batch_size):
+        if first_row is None:
+            first_row = time.perf_counter() - started
+        rows += item_rows(item)
+    elapsed = time.perf_counter() - started
+    return {
+        "strategy": strategy,
+        "batch_size": None if strategy in UNBATCHED else batch_size,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+        "first_row_s": first_row,
+        "peak_rss_mb": peak_rss_mb(),
+        "round_trips": counting.statements,
+        "connects": counting.connects,
+    }
+
+
+def table_rows() -> int:
+    conn = seed.connect_to_prodev()
+    if conn is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM user_data;")
+    (count,) = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return int(count)
+
+
+def seed_synthetic(rows: int, reset: bool, batch_size: int = 5000) -> int:
+    """
+    Bring user_data up to `rows` rows with synthetic users (via a temporary
+    CSV and seed.insert_data). With `reset`, existing rows are deleted
+    first. Returns the resulting row count.
+    """
+    conn = seed.connect_db()
+    if conn is not None:
+        seed.create_database(conn)
+        conn.close()
+    conn = seed.connect_to_prodev()
+    if conn is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+    seed.create_table(conn)
+    if reset:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM user_data;")
+        conn.commit()
+        cursor.close()
+
+    missing = rows - table_rows()
+    if missing > 0:
+        rng = random.Random(rows)
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", newline="", encoding="utf-8", delete=False
+        ) as f:
+            writer = csv.writer(f)
+            writer.writerow(seed.COLUMNS)
+            for i in range(missing):
+                writer.writerow((uuid.UUID(int=rng.getrandbits(128), version=4),
+                                 f"User {i}", f"user{i}@example.com",
+                                 rng.randint(18, 99)))
+        try:
+            seed.insert_data(conn, f.name, batch_size=batch_size)
+        finally:
+            os.unlink(f.name)
+    conn.close()
+    return table_rows()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000,
+                        help="target user_data size (1e4 .. 1e7)")
+    parser.add_argument("--reset", action="store_true",
+                        help="delete existing user_data rows before seeding")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES,
+                        default=list(STRATEGIES))
+    parser.add_argument("--batch-sizes", type=int, nargs="+",
+                        default=[100, 1000, 10000])
+    parser.add_argument("--output", default=None,
+                        help="JSON lines file (default: stdout)")
+    parser.add_argument("--run", nargs=2, metavar=("STRATEGY", "BATCH_SIZE"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_one(args.run[0], int(args.run[1]))))
+        return
+
+    actual = seed_synthetic(args.rows, args.reset)
+    meta = {
+        "backend": seed.get_backend().name,
+        "table_rows": actual,
+        "python": sys.version.split()[0],
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    print(f"{'strategy':>24} {'batch':>6} {'rows/s':>10} {'first_ms':>9} "
+          f"{'rss_mb':>7} {'trips':>7} {'conns':>5}", file=sys.stderr)
+    try:
+        for strategy in args.strategies:
+            sizes = args.batch_sizes[:1] if strategy in UNBATCHED else args.batch_sizes
+            for batch_size in sizes:
+                proc = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__),
+                     "--run", strategy, str(batch_size)],
+                    cwd=DIR, capture_output=True, text=True, check=True,
+                )
+                result = {**meta, **json.loads(proc.stdout.strip().splitlines()[-1])}
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                first_ms = (result["first_row_s"] or 0.0) * 1000
+                print(f"{strategy:>24} {str(result['batch_size'] or '-'):>6} "
+                      f"{result['rows_per_sec']:>10.0f} {first_ms:>9.2f} "
+                      f"{result['peak_rss_mb']:>7.1f} {result['round_trips']:>7} "
+                      f"{result['connects']:>5}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
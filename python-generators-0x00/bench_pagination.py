@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pagination benchmark for 2-lazy_paginate.
+
+Compares the latency of fetching one page at increasing depths with
+LIMIT/OFFSET (paginate_users' query) versus a keyset seek on user_id
+(paginate_users_after), then the throughput of walking the first --pages
+pages with OFFSET versus a keyset seek. Both strategies run on one
+already-open connection, so only the query strategy differs (the
+paginate_users API itself opens a connection per page).
+
+Usage:
+    python bench_pagination.py --page-size 100 --depths 0 1000 10000 100000
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, Generator, List, Optional
+
+import seed
+
+paginate = __import__('2-lazy_paginate')
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    """Best wall-clock time in ms over `repeat` calls of fn."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def user_id_before(connection, position: int) -> Optional[str]:
+    """user_id of the row just before `position` in key order (setup only)."""
+    if position == 0:
+        return None
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT user_id FROM user_data ORDER BY user_id LIMIT 1 OFFSET %s",
+        (position - 1,),
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    return row[0] if row else None
+
+
+def offset_page(connection, page_size: int, offset: int) -> List[Dict]:
+    """paginate_users' LIMIT/OFFSET query, run on `connection`."""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"SELECT {paginate.COLUMNS} FROM {paginate.TABLE_NAME} "
+                       f"LIMIT {page_size} OFFSET {offset}")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def offset_pages(connection, page_size: int) -> Generator[List[Dict], None, None]:
+    """lazy_paginate's OFFSET walk, on `connection`."""
+    offset = 0
+    while True:
+        page = offset_page(connection, page_size, offset)
+        if not page:
+            break
+        yield page
+        offset += page_size
+
+
+def keyset_pages(connection, page_size: int) -> Generator[List[Dict], None, None]:
+    """lazy_paginate_keyset's walk, on `connection`."""
+    last_user_id = None
+    while True:
+        page = paginate.paginate_users_after(connection, page_size, last_user_id)
+        if not page:
+            break
+        yield page
+        if len(page) < page_size:
+            break
+        last_user_id = page[-1]["user_id"]
+
+
+def walk(pages, limit: int) -> int:
+    """Consume up to `limit` pages; return the number of rows seen."""
+    rows = 0
+    for index, page in enumerate(pages, start=1):
+        rows += len(page)
+        if index >= limit:
+            pages.close()
+            break
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--depths", type=int, nargs="+",
+                        default=[0, 1_000, 10_000, 100_000, 1_000_000],
+                        help="page numbers to time")
+    parser.add_argument("--pages", type=int, default=200,
+                        help="pages to walk in the throughput test")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    connection = seed.connect_to_prodev()
+    if connection is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+
+    try:
+        run(connection, args)
+    finally:
+        connection.close()
+
+
+def run(connection, args: argparse.Namespace) -> None:
+    print(f"page_size={args.page_size}")
+    print(f"{'page':>10} {'offset_ms':>12} {'keyset_ms':>12} {'speedup':>9}")
+    for depth in args.depths:
+        position = depth * args.page_size
+        after = user_id_before(connection, position)
+        if position and after is None:
+            print(f"{depth:>10} {'(past end of table)':>35}")
+            continue
+        offset_ms = best_of(
+            args.repeat, lambda: offset_page(connection, args.page_size, position))
+        keyset_ms = best_of(
+            args.repeat,
+            lambda: paginate.paginate_users_after(connection, args.page_size, after))
+        speedup = offset_ms / keyset_ms if keyset_ms else 0.0
+        print(f"{depth:>10} {offset_ms:>12.2f} {keyset_ms:>12.2f} {speedup:>8.1f}x")
+
+    results: List[str] = []
+    for name, pages in (
+        ("offset", offset_pages(connection, args.page_size)),
+        ("keyset", keyset_pages(connection, args.page_size)),
+    ):
+        started = time.perf_counter()
+        rows = walk(pages, args.pages)
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        results.append(f"{name}: {rows} rows in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    print(f"walk of first {args.pages} pages")
+    for line in results:
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Prefetch benchmark for 2-lazy_paginate.
+
+Walks --pages pages with a simulated per-page consumer cost (--work-ms)
+using the sequential pager and the prefetching pager at each --depths
+value, and reports end-to-end throughput. Sequential time is roughly
+pages * (fetch + work); prefetching approaches pages * max(fetch, work).
+
+Usage:
+    python bench_prefetch.py --page-size 100 --pages 200 --work-ms 5
+"""
+
+import argparse
+import time
+from typing import Iterator, List
+
+paginate = __import__('2-lazy_paginate')
+
+
+def consume(pages: Iterator[List], limit: int, work_s: float) -> int:
+    """Consume up to `limit` pages, sleeping `work_s` per page."""
+    rows = 0
+    for index, page in enumerate(pages, start=1):
+        rows += len(page)
+        time.sleep(work_s)
+        if index >= limit:
+            pages.close()
+            break
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--work-ms", type=float, default=5.0,
+                        help="simulated consumer time per page")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--keyset", action="store_true",
+                        help="page with keyset seeks instead of OFFSET")
+    args = parser.parse_args()
+
+    def sequential():
+        if args.keyset:
+            return paginate.lazy_paginate_keyset(args.page_size)
+        return paginate.lazy_paginate(args.page_size)
+
+    runs = [("sequential", sequential)]
+    for depth in args.depths:
+        runs.append((
+            f"prefetch={depth}",
+            lambda depth=depth: paginate.lazy_paginate_prefetched(
+                args.page_size, depth, args.keyset),
+        ))
+
+    print(f"page_size={args.page_size} pages={args.pages} "
+          f"work_ms={args.work_ms} keyset={args.keyset}")
+    print(f"{'mode':>12} {'rows':>8} {'seconds':>9} {'rows_per_sec':>13}")
+    for name, make_pages in runs:
+        started = time.perf_counter()
+        rows = consume(make_pages(), args.pages, args.work_ms / 1000)
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        print(f"{name:>12} {rows:>8} {elapsed:>9.2f} {rate:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
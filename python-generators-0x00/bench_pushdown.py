@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Push-down benchmark for 1-batch_processing.
+
+Streams `age > --min-age` users three ways and reports rows delivered,
+time, the payload size the client received and the server's Bytes_sent
+delta (global status, so run it on a quiet server):
+
+- python:  every column of every row, filtered in Python (pushdown=False)
+- where:   WHERE compiled into the query, every column
+- project: WHERE compiled into the query, only user_id and age selected
+
+Usage:
+    python bench_pushdown.py --batch-size 1000 --min-age 25
+"""
+
+import argparse
+import time
+from typing import Dict, Optional, Sequence
+
+import seed
+
+processing = __import__('1-batch_processing')
+
+
+def server_bytes_sent(connection) -> int:
+    """Server-wide Bytes_sent counter."""
+    cursor = connection.cursor()
+    cursor.execute("SHOW GLOBAL STATUS LIKE 'Bytes_sent';")
+    _, value = cursor.fetchone()
+    cursor.close()
+    return int(value)
+
+
+def payload_bytes(row: tuple) -> int:
+    """Approximate bytes of the values in one row as sent in text protocol."""
+    return sum(len(str(value)) for value in row)
+
+
+def run(
+    monitor, batch_size: int, min_age: int,
+    columns: Optional[Sequence[str]], pushdown: bool,
+) -> Dict[str, float]:
+    """Stream one configuration and collect its numbers."""
+    before = server_bytes_sent(monitor)
+    started = time.perf_counter()
+    rows = 0
+    payload = 0
+    batches = processing.stream_users_in_batches(
+        batch_size, "tuple", columns=columns,
+        where=[("age", ">", min_age)], pushdown=pushdown,
+    )
+    for batch in batches:
+        rows += len(batch)
+        payload += sum(map(payload_bytes, batch))
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "payload_bytes": payload,
+        "server_bytes": server_bytes_sent(monitor) - before,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--min-age", type=int, default=25)
+    args = parser.parse_args()
+
+    monitor = seed.connect_to_prodev()
+    if monitor is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+
+    configs = (
+        ("python", None, False),
+        ("where", None, True),
+        ("project", ("user_id", "age"), True),
+    )
+    print(f"{'mode':>8} {'rows':>10} {'seconds':>9} {'payload_mb':>11} "
+          f"{'server_mb':>10}")
+    baseline = None
+    for name, columns, pushdown in configs:
+        result = run(monitor, args.batch_size, args.min_age, columns, pushdown)
+        if baseline is None:
+            baseline = result["server_bytes"]
+        # Zero when the server reports no byte counters (or sent nothing)
+        share = (f"  ({result['server_bytes'] / baseline:.0%} of python)"
+                 if baseline else "")
+        print(f"{name:>8} {result['rows']:>10} {result['seconds']:>9.2f} "
+              f"{result['payload_bytes'] / 1e6:>11.2f} "
+              f"{result['server_bytes'] / 1e6:>10.2f}{share}")
+    monitor.close()
+
+
+if __name__ == "__main__":
+    main()
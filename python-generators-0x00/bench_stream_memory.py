@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for 0-stream_users.
+
+Iterates user_data with one streaming mode and samples the process RSS
+every --every rows, so a flat RSS column shows the stream is bounded.
+
+Usage:
+    python bench_stream_memory.py --mode unbuffered --prefetch 1000
+    python bench_stream_memory.py --mode buffered      # for contrast
+
+Modes:
+    - stream:     stream_users() (unbuffered cursor, row at a time)
+    - unbuffered: stream_users_unbuffered(prefetch)
+    - buffered:   a buffered dict cursor (whole result set client-side)
+
+Run one mode per process so peak RSS of one mode doesn't hide another's.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+from typing import Dict, Iterator
+
+import seed
+
+stream_module = __import__('0-stream_users')
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def buffered_rows() -> Iterator[Dict]:
+    """Baseline: buffered dict cursor, result set fully fetched by execute."""
+    conn = seed.connect_to_prodev()
+    if conn is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+    cursor = conn.cursor(dictionary=True, buffered=True)
+    try:
+        cursor.execute("SELECT user_id, name, email, age FROM user_data;")
+        yield from cursor
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=("stream", "unbuffered", "buffered"),
+                        default="unbuffered")
+    parser.add_argument("--prefetch", type=int, default=stream_module.DEFAULT_PREFETCH)
+    parser.add_argument("--every", type=int, default=1_000_000,
+                        help="sample RSS every N rows")
+    parser.add_argument("--limit", type=int, default=0,
+                        help="stop after N rows (0 = whole table)")
+    args = parser.parse_args()
+
+    if args.mode == "stream":
+        rows = stream_module.stream_users()
+    elif args.mode == "unbuffered":
+        rows = stream_module.stream_users_unbuffered(args.prefetch)
+    else:
+        rows = buffered_rows()
+
+    start_rss = rss_mb()
+    started = time.perf_counter()
+    print(f"mode={args.mode} prefetch={args.prefetch}")
+    print(f"{'rows':>12} {'rss_mb':>10} {'elapsed_s':>10}")
+    count = 0
+    samples = []
+    for _ in rows:
+        count += 1
+        if count % args.every == 0:
+            samples.append(rss_mb())
+            print(f"{count:>12} {samples[-1]:>10.1f} "
+                  f"{time.perf_counter() - started:>10.2f}")
+        if args.limit and count >= args.limit:
+            rows.close()
+            break
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    spread = (max(samples) - min(samples)) if samples else 0.0
+    print(f"rows={count} seconds={elapsed:.2f} rows_per_sec={rate:.0f}")
+    print(f"rss_start_mb={start_rss:.1f} rss_peak_mb={peak_rss_mb():.1f} "
+          f"rss_spread_mb={spread:.1f}")
+
+
+if __name__ == "__main__":
+    main()
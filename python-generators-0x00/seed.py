@@ -2,22 +2,61 @@
 """
 Seed script for MySQL: create ALX_prodev.user_data and load CSV data.
 
+Backends:
+- MySQLBackend (default): mysql.connector, configured by MYSQL_* env vars
+- SQLiteBackend: a local SQLite file with the same user_data schema, for
+  running and benchmarking the generators without a MySQL server
+Select one with SEED_BACKEND=mysql|sqlite (and SQLITE_PATH) or
+set_backend("sqlite", path=...). Every function below goes through the
+active backend.
+
 Functions:
 - connect_db() -> mysql connection to server (no DB selected)
 - create_database(connection) -> create DB ALX_prodev if missing
-- connect_to_prodev() -> mysql connection to ALX_prodev
+- connect_to_prodev() -> mysql connection to ALX_prodev, checked out of a
+  shared ConnectionPool; close() returns it to the pool
+- configure_pool(...), pool_stats(), close_pool() -> manage the shared pool
 - create_table(connection) -> create user_data if missing
-- insert_data(connection, data) -> insert rows from CSV idempotently
+- insert_data(connection, data) -> insert rows from CSV idempotently,
+  in multi-row batches or via LOAD DATA LOCAL INFILE
+- insert_data_parallel(data, workers) -> same, partitioned across processes
 """
 
+from __future__ import annotations
+
 import os
 import csv
-from typing import Optional
-import mysql.connector
-from mysql.connector import Error
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple,
+    Union,
+)
+
+try:
+    import mysql.connector
+    from mysql.connector import Error
+except ImportError:  # only the SQLite backend works without the driver
+    mysql = None
+
+    class Error(Exception):
+        """Stand-in for mysql.connector.Error when the driver is missing."""
+
+        def __init__(self, msg=None, errno=None, values=None, sqlstate=None):
+            super().__init__(msg)
+            self.msg = msg
+            self.errno = errno
 
 DB_NAME = "ALX_prodev"
 TABLE_NAME = "user_data"
+COLUMNS = ("user_id", "name", "email", "age")
+DEFAULT_BATCH_SIZE = 1000
+POOL_ENABLED = os.getenv("MYSQL_POOL", "1") != "0"
 
 
 def _mysql_config():
@@ -29,14 +68,212 @@ def _mysql_config():
     }
 
 
+class MySQLBackend:
+    """mysql.connector connections configured from MYSQL_* variables."""
+
+    name = "mysql"
+
+    def _driver(self):
+        if mysql is None:
+            raise Error(msg="mysql-connector-python is not installed")
+        return mysql.connector
+
+    def connect_server(self):
+        """Connection to the server with no database selected."""
+        return self._driver().connect(**_mysql_config())
+
+    def connect(self, **options):
+        """Connection to ALX_prodev; `options` go to mysql.connector."""
+        cfg = _mysql_config()
+        cfg.update(options)
+        return self._driver().connect(database=DB_NAME, **cfg)
+
+
+class SQLiteBackend:
+    """
+    SQLite stand-in for MySQL. Connections are wrapped in SQLiteConnection,
+    which accepts the MySQL dialect used by these modules, so callers don't
+    change. The file path defaults to SQLITE_PATH or ALX_prodev.sqlite3
+    next to this file.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or os.getenv(
+            "SQLITE_PATH",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         f"{DB_NAME}.sqlite3"),
+        )
+
+    def connect_server(self) -> "SQLiteConnection":
+        # SQLite has no server; the database is the file itself
+        return self.connect()
+
+    def connect(self, **options) -> "SQLiteConnection":
+        """`options` (e.g. allow_local_infile) have no SQLite meaning."""
+        try:
+            # Pooled connections may be handed to other threads, but are
+            # never used by two threads at once
+            raw = sqlite3.connect(self.path, check_same_thread=False)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+        return SQLiteConnection(raw)
+
+
+# (pattern, replacement) rewrites from the MySQL dialect used here
+_SQLITE_REWRITES = (
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\)\s*ENGINE\s*=.*?(;|$)", re.I | re.S), r")\1"),
+    (re.compile(r"%s"), "?"),
+    # The SQLite file is the ALX_prodev database, so it is the only schema
+    (re.compile(r"\bINFORMATION_SCHEMA\.SCHEMATA\b", re.I),
+     f"(SELECT '{DB_NAME}' AS SCHEMA_NAME)"),
+)
+_SQLITE_NOOPS = re.compile(r"^\s*CREATE\s+DATABASE\b", re.I)
+_SQLITE_UNSUPPORTED = re.compile(r"^\s*(LOAD\s+DATA|SHOW)\b", re.I)
+
+
+def _to_sqlite(sql: str) -> Optional[str]:
+    """Translate a statement to SQLite; None means skip it."""
+    if _SQLITE_NOOPS.match(sql):
+        return None
+    if _SQLITE_UNSUPPORTED.match(sql):
+        raise Error(msg=f"Not supported by the SQLite backend: {sql.split()[0]} ...")
+    for pattern, replacement in _SQLITE_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+class SQLiteCursor:
+    """Subset of the mysql.connector cursor API over a sqlite3 cursor."""
+
+    def __init__(self, raw: sqlite3.Cursor, dictionary: bool = False) -> None:
+        self._raw = raw
+        self._dictionary = dictionary
+        self._names: Tuple[str, ...] = ()
+
+    def _rows(self, rows: List[tuple]) -> List[Any]:
+        if not self._dictionary:
+            return rows
+        names = self._names
+        return [dict(zip(names, row)) for row in rows]
+
+    def execute(self, sql: str, params: Sequence = ()) -> None:
+        sql = _to_sqlite(sql)
+        if sql is None:
+            return
+        try:
+            self._raw.execute(sql, tuple(params or ()))
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+        description = self._raw.description or ()
+        self._names = tuple(column[0] for column in description)
+
+    def executemany(self, sql: str, seq_params: Iterable[Sequence]) -> None:
+        sql = _to_sqlite(sql)
+        if sql is None:
+            return
+        try:
+            self._raw.executemany(sql, seq_params)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+
+    def fetchone(self) -> Any:
+        row = self._raw.fetchone()
+        return row if row is None else self._rows([row])[0]
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        return self._rows(self._raw.fetchmany(size))
+
+    def fetchall(self) -> List[Any]:
+        return self._rows(self._raw.fetchall())
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self._dictionary:
+            return iter(self._raw)
+        names = self._names
+        return (dict(zip(names, row)) for row in self._raw)
+
+    @property
+    def rowcount(self) -> int:
+        return self._raw.rowcount
+
+    @property
+    def description(self):
+        return self._raw.description
+
+    def close(self) -> None:
+        self._raw.close()
+
+
+class SQLiteConnection:
+    """Subset of the mysql.connector connection API over sqlite3."""
+
+    unread_result = False
+
+    def __init__(self, raw: sqlite3.Connection) -> None:
+        self._raw = raw
+
+    def cursor(self, dictionary: bool = False, buffered: Optional[bool] = None,
+               **_: Any) -> SQLiteCursor:
+        # sqlite3 cursors step lazily, so they are always "unbuffered"
+        return SQLiteCursor(self._raw.cursor(), dictionary)
+
+    def is_connected(self) -> bool:
+        try:
+            self._raw.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._raw.in_transaction
+
+    def commit(self) -> None:
+        self._raw.commit()
+
+    def rollback(self) -> None:
+        self._raw.rollback()
+
+    def close(self) -> None:
+        self._raw.close()
+
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+_backend = BACKENDS[os.getenv("SEED_BACKEND", "mysql")]()
+
+
+def get_backend():
+    """The active backend."""
+    return _backend
+
+
+def set_backend(name, **options) -> None:
+    """
+    Switch to the named backend ("mysql" or "sqlite"); `options` go to its
+    constructor (e.g. path= for SQLite). A backend instance (anything with
+    connect_server() and connect()) may be passed instead of a name.
+    Resets the shared pool.
+    """
+    global _backend
+    if not isinstance(name, str):
+        _backend = name
+    elif name in BACKENDS:
+        _backend = BACKENDS[name](**options)
+    else:
+        raise ValueError(f"backend must be one of {tuple(BACKENDS)}")
+    configure_pool(**_pool_options)
+
+
 def connect_db() -> Optional[mysql.connector.MySQLConnection]:
     """
     Connect to MySQL server (no database selected).
     Returns a connection or None if connection fails.
     """
-    cfg = _mysql_config()
     try:
-        conn = mysql.connector.connect(**cfg)
+        conn = get_backend().connect_server()
         if conn.is_connected():
             return conn
     except Error as e:
@@ -60,16 +297,290 @@ def create_database(connection) -> None:
         print(f"Error creating database: {e}")
 
 
-def connect_to_prodev() -> Optional[mysql.connector.MySQLConnection]:
+class PoolTimeout(Error):
+    """Raised when no pooled connection frees up within the timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of connections created by `factory`.
+
+    - size: idle connections kept for reuse
+    - max_overflow: extra connections allowed under load; they are closed
+      on release instead of being kept
+    - timeout: seconds acquire() waits for a free connection
+    - idle_timeout: idle connections older than this are reaped (closed)
+      on the next acquire/release
+    - health_check: ping idle connections on checkout and replace dead ones
+
+    Metrics from stats(): checkouts, hits (reused an idle connection),
+    misses (opened a new one), hit_ratio, waits and wait_seconds (callers
+    that had to block), health_failures, reaped, discarded, leaked
+    (garbage-collected without close(); their slot is freed and the
+    connection closed), idle, in_use.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 5,
+        max_overflow: int = 5,
+        timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        health_check: bool = True,
+    ) -> None:
+        if size <= 0 or max_overflow < 0:
+            raise ValueError("size must be > 0 and max_overflow >= 0")
+        self.factory = factory
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.pid = os.getpid()
+        self._idle: deque = deque()  # (connection, released_at)
+        self._in_use = 0
+        self._lock = threading.Condition()
+        self._stats = dict.fromkeys(
+            ("checkouts", "hits", "misses", "waits", "health_failures",
+             "reaped", "discarded", "leaked"), 0)
+        self._stats["wait_seconds"] = 0.0
+
+    def acquire(self) -> "PooledConnection":
+        """Check out a connection, reusing an idle one when possible."""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        with self._lock:
+            stale = self._reap()
+        for old in stale:
+            self._close(old)
+        with self._lock:
+            wait_started = time.monotonic()
+            while not self._idle and self._in_use >= self.size + self.max_overflow:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["wait_seconds"] += time.monotonic() - wait_started
+                    raise PoolTimeout(
+                        msg=f"No pooled connection free after {self.timeout}s")
+                if not waited:
+                    waited = True
+                    self._stats["waits"] += 1
+                self._lock.wait(remaining)
+            if waited:
+                self._stats["wait_seconds"] += time.monotonic() - wait_started
+            self._stats["checkouts"] += 1
+            self._in_use += 1
+            conn = self._idle.pop()[0] if self._idle else None
+
+        try:
+            if conn is not None and self.health_check and not self._alive(conn):
+                with self._lock:
+                    self._stats["health_failures"] += 1
+                self._close(conn)
+                conn = None
+            if conn is None:
+                conn = self.factory()
+                with self._lock:
+                    self._stats["misses"] += 1
+            else:
+                with self._lock:
+                    self._stats["hits"] += 1
+        except BaseException:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+        return PooledConnection(self, conn)
+
+    def release(self, conn) -> None:
+        """Return a connection; dirty or surplus connections are closed."""
+        keep = self._reset(conn)
+        with self._lock:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            elif not keep:
+                self._stats["discarded"] += 1
+            stale = self._reap()
+            self._lock.notify()
+        if conn is not None:
+            stale.append(conn)
+        for old in stale:
+            self._close(old)
+
+    def _reclaim(self, conn) -> None:
+        """Free the slot of a checked-out connection that was never closed."""
+        with self._lock:
+            self._in_use -= 1
+            self._stats["leaked"] += 1
+            self._lock.notify()
+        self._close(conn)
+
+    def close_all(self) -> None:
+        """Close every idle connection (checked-out ones close on release)."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of the pool metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._in_use
+        checkouts = stats["checkouts"]
+        stats["hit_ratio"] = stats["hits"] / checkouts if checkouts else 0.0
+        return stats
+
+    def _reap(self) -> List[Any]:
+        """Remove connections idle longer than idle_timeout (lock held)
+        and return them; the caller closes them after releasing the lock.
+        The oldest idle connections sit at the left of the deque."""
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = []
+        while self._idle and self._idle[0][1] < cutoff:
+            stale.append(self._idle.popleft()[0])
+        self._stats["reaped"] += len(stale)
+        return stale
+
+    @staticmethod
+    def _alive(conn) -> bool:
+        try:
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(conn) -> bool:
+        """
+        Make a connection safe to reuse. Connections with unread rows (an
+        unbuffered stream stopped early) are not reusable: draining them
+        could mean reading the rest of the table.
+        """
+        try:
+            if getattr(conn, "unread_result", False):
+                return False
+            if getattr(conn, "in_transaction", False):
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class PooledConnection:
+    """
+    Proxy for a pooled connection. Behaves like the wrapped connection,
+    except that close() (or leaving a `with` block) returns it to the pool.
+    A proxy garbage-collected without close() closes the connection and
+    frees its pool slot.
+    """
+
+    def __init__(self, pool: ConnectionPool, conn) -> None:
+        self._pool = pool
+        self._conn = conn
+        self._finalizer = weakref.finalize(self, pool._reclaim, conn)
+
+    def __getattr__(self, name: str):
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise Error(msg="Connection already returned to the pool")
+        return getattr(conn, name)
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._finalizer.detach()
+            self._pool.release(conn)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_options: Dict[str, Any] = {}
+_pool_lock = threading.Lock()
+
+
+def _open_prodev(**options) -> mysql.connector.MySQLConnection:
+    """Open a new connection to ALX_prodev; raises Error on failure."""
+    conn = get_backend().connect(**options)
+    if not conn.is_connected():
+        raise Error(msg=f"Connection to {DB_NAME} is not usable")
+    return conn
+
+
+def get_pool() -> ConnectionPool:
+    """
+    The shared ALX_prodev pool, created on first use. A process forked
+    from one that already had a pool gets a fresh one instead of sharing
+    the parent's sockets.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ConnectionPool(_open_prodev, **_pool_options)
+        return _pool
+
+
+def configure_pool(**options) -> None:
+    """
+    Set ConnectionPool options (size, max_overflow, timeout, idle_timeout,
+    health_check) for the shared pool, closing the current one.
+    """
+    global _pool
+    ConnectionPool(_open_prodev, **options)  # validate before swapping
+    with _pool_lock:
+        old, _pool = _pool, None
+        _pool_options.clear()
+        _pool_options.update(options)
+    if old is not None and old.pid == os.getpid():
+        old.close_all()
+
+
+def pool_stats() -> Dict[str, float]:
+    """Metrics of the shared pool."""
+    return get_pool().stats()
+
+
+def close_pool() -> None:
+    """Close the shared pool's idle connections."""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        pool.close_all()
+
+
+def connect_to_prodev(
+    allow_local_infile: bool = False,
+) -> Optional[Union[PooledConnection, mysql.connector.MySQLConnection]]:
     """
     Connect directly to ALX_prodev database.
     Returns a connection or None on failure.
+
+    The connection comes from the shared pool; calling close() returns it.
+    Set MYSQL_POOL=0 to open a dedicated connection per call instead.
+
+    - allow_local_infile: enable LOAD DATA LOCAL INFILE on this connection
+      (always a dedicated, unpooled connection)
     """
-    cfg = _mysql_config()
     try:
-        conn = mysql.connector.connect(database=DB_NAME, **cfg)
-        if conn.is_connected():
-            return conn
+        if allow_local_infile:
+            return _open_prodev(allow_local_infile=True)
+        if not POOL_ENABLED:
+            return _open_prodev()
+        return get_pool().acquire()
     except Error as e:
         print(f"Error connecting to database {DB_NAME}: {e}")
     return None
@@ -102,45 +613,274 @@ def create_table(connection) -> None:
         print(f"Error creating table: {e}")
 
 
-def insert_data(connection, data: str) -> None:
+def _resolve_csv_path(data: str) -> str:
+    """Resolve a CSV path relative to this file's directory."""
+    if os.path.isabs(data):
+        return data
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), data)
+
+
+def _coerce_row(row: Dict[str, str]) -> Tuple[str, str, str, int]:
+    """Turn a CSV dict row into an insertable tuple (age as int)."""
+    # Coerce age to numeric (DECIMAL(5,0) -> integer ok)
+    age = int(str(row.get("age")).strip())
+    return (row.get("user_id"), row.get("name"), row.get("email"), age)
+
+
+def _iter_csv_rows(csv_path: str) -> Iterator[Tuple[str, str, str, int]]:
+    """Yield coerced (user_id, name, email, age) tuples from the CSV."""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield _coerce_row(row)
+
+
+def _insert_sql(rows: int) -> str:
+    """Build a multi-row INSERT IGNORE statement for `rows` rows."""
+    placeholders = ", ".join(["(%s, %s, %s, %s)"] * rows)
+    return (
+        f"INSERT IGNORE INTO {TABLE_NAME} ({', '.join(COLUMNS)}) "
+        f"VALUES {placeholders};"
+    )
+
+
+def _insert_batch(cursor, batch: List[Tuple]) -> int:
+    """Insert one batch as a single statement; return rows actually inserted."""
+    params = [value for row in batch for value in row]
+    cursor.execute(_insert_sql(len(batch)), params)
+    # For INSERT IGNORE, rowcount only counts rows that were not duplicates
+    return max(cursor.rowcount, 0)
+
+
+def _insert_rows(connection, rows_iter, batch_size: int) -> Tuple[int, int]:
+    """
+    Insert rows in batches, committing after each batch.
+    Returns (rows_seen, rows_inserted).
+    """
+    rows = 0
+    inserted = 0
+    cursor = connection.cursor()
+    try:
+        batch: List[Tuple] = []
+        for row in rows_iter:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                inserted += _insert_batch(cursor, batch)
+                connection.commit()
+                rows += len(batch)
+                batch = []
+        if batch:
+            inserted += _insert_batch(cursor, batch)
+            rows += len(batch)
+        connection.commit()
+    finally:
+        cursor.close()
+    return rows, inserted
+
+
+def _count_csv_rows(csv_path: str) -> int:
+    """Count data rows (lines minus header) without parsing the CSV."""
+    lines = 0
+    last = b""
+    with open(csv_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last and last != b"\n":
+        lines += 1  # last line has no trailing newline
+    return max(lines - 1, 0)
+
+
+def _load_data_local_infile(connection, csv_path: str) -> Tuple[int, int]:
+    """
+    Load the CSV with LOAD DATA LOCAL INFILE.
+    Returns (rows_in_file, rows_inserted).
+    """
+    total = _count_csv_rows(csv_path)
+
+    sql = f"""
+    LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {TABLE_NAME}
+    CHARACTER SET utf8mb4
+    FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+    LINES TERMINATED BY '\\n'
+    IGNORE 1 LINES
+    (user_id, name, email, @age)
+    SET age = TRIM(@age);
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql, (csv_path,))
+        inserted = max(cursor.rowcount, 0)
+        connection.commit()
+    finally:
+        cursor.close()
+    return total, inserted
+
+
+def _report(rows: int, inserted: int, started: float) -> Dict[str, float]:
+    """Print and return ingest statistics."""
+    elapsed = time.perf_counter() - started
+    stats = {
+        "rows": rows,
+        "inserted": inserted,
+        "duplicates": rows - inserted,
+        "seconds": elapsed,
+        "rows_per_sec": (rows / elapsed) if elapsed > 0 else 0.0,
+    }
+    print(
+        f"Inserted {inserted} new row(s), skipped {stats['duplicates']} "
+        f"duplicate(s) in {elapsed:.2f}s ({stats['rows_per_sec']:.0f} rows/s)"
+    )
+    return stats
+
+
+def insert_data(
+    connection,
+    data: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    local_infile: bool = False,
+) -> Optional[Dict[str, float]]:
     """
     Insert CSV rows into user_data if they don't exist.
 
     - data: path to CSV (e.g., 'user_data.csv')
     - CSV must have headers: user_id,name,email,age
     - Uses INSERT IGNORE for idempotency
+    - batch_size: rows per multi-row INSERT statement (one commit per batch)
+    - local_infile: try LOAD DATA LOCAL INFILE first; the connection must be
+      opened with connect_to_prodev(allow_local_infile=True). Falls back to
+      batched inserts if the server or client refuses it.
+
+    Returns a stats dict (rows, inserted, duplicates, seconds, rows_per_sec)
+    or None if the CSV could not be loaded.
     """
-    csv_path = data
-    if not os.path.isabs(csv_path):
-        # resolve relative to this file's directory
-        csv_path = os.path.join(os.path.dirname(__file__), data)
+    if batch_size <= 0:
+        raise ValueError("batch_size must be > 0")
 
+    csv_path = _resolve_csv_path(data)
     if not os.path.exists(csv_path):
         print(f"CSV not found at {csv_path}")
-        return
+        return None
 
-    sql = f"""
-    INSERT IGNORE INTO {TABLE_NAME} (user_id, name, email, age)
-    VALUES (%s, %s, %s, %s);
+    started = time.perf_counter()
+    if local_infile:
+        try:
+            rows, inserted = _load_data_local_infile(connection, csv_path)
+            return _report(rows, inserted, started)
+        except Error as e:
+            print(f"LOAD DATA LOCAL INFILE unavailable ({e}); using batched inserts")
+            connection.rollback()
+
+    try:
+        rows, inserted = _insert_rows(connection, _iter_csv_rows(csv_path), batch_size)
+    except Error as e:
+        print(f"Error inserting data: {e}")
+        return None
+    except Exception as e:
+        print(f"Error reading CSV: {e}")
+        return None
+    return _report(rows, inserted, started)
+
+
+def _csv_partitions(csv_path: str, parts: int) -> Tuple[List[str], List[Tuple[int, int]]]:
     """
+    Split the CSV body into `parts` byte ranges.
+    Returns (header fieldnames, [(start, end), ...]). A row belongs to the
+    range its first byte falls in, so ranges never split or repeat a row.
+    """
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+    fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+    span = max(size - body_start, 0)
+    parts = max(1, min(parts, span or 1))
+    bounds = [body_start + (span * i) // parts for i in range(parts + 1)]
+    return fieldnames, list(zip(bounds[:-1], bounds[1:]))
+
+
+def _iter_partition_rows(
+    csv_path: str, fieldnames: List[str], start: int, end: int
+) -> Iterator[Tuple[str, str, str, int]]:
+    """Yield coerced rows whose line starts inside [start, end)."""
+    with open(csv_path, "rb") as f:
+        # Skip the row straddling `start`; the previous partition owns it
+        f.seek(start - 1)
+        f.readline()
+
+        def lines():
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                yield line.decode("utf-8")
+
+        for row in csv.DictReader(lines(), fieldnames=fieldnames):
+            yield _coerce_row(row)
+
+
+def _insert_partition(task: Tuple[str, List[str], int, int, int]) -> Tuple[int, int]:
+    """Worker: parse one byte range and insert it over its own connection."""
+    csv_path, fieldnames, start, end, batch_size = task
+    connection = connect_to_prodev()
+    if connection is None:
+        raise RuntimeError("Could not connect to ALX_prodev database")
+    try:
+        rows = _iter_partition_rows(csv_path, fieldnames, start, end)
+        return _insert_rows(connection, rows, batch_size)
+    finally:
+        connection.close()
+
+
+def insert_data_parallel(
+    data: str,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Optional[Dict[str, float]]:
+    """
+    Insert CSV rows into user_data using a pool of worker processes.
+
+    - data: path to CSV (e.g., 'user_data.csv')
+    - workers: number of processes/partitions (default: os.cpu_count())
+    - batch_size: rows per multi-row INSERT statement in each worker
+    - Each worker parses its own byte range of the CSV and inserts over its
+      own connection with INSERT IGNORE, so re-runs stay idempotent
+    - Rows must not contain embedded newlines (true for user_data.csv)
+
+    Returns the same stats dict as insert_data, plus `workers`.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be > 0")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    csv_path = _resolve_csv_path(data)
+    if not os.path.exists(csv_path):
+        print(f"CSV not found at {csv_path}")
+        return None
+
+    started = time.perf_counter()
+    fieldnames, ranges = _csv_partitions(csv_path, workers)
+    tasks = [(csv_path, fieldnames, start, end, batch_size) for start, end in ranges]
+    rows = 0
     inserted = 0
     try:
-        cursor = connection.cursor()
-        with open(csv_path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                user_id = row.get("user_id")
-                name = row.get("name")
-                email = row.get("email")
-                age_raw = row.get("age")
-                # Coerce age to numeric (DECIMAL(5,0) -> integer ok)
-                age = int(str(age_raw).strip())
-                cursor.execute(sql, (user_id, name, email, age))
-                inserted += cursor.rowcount  # rowcount is 1 for new, 0 for ignored
-        connection.commit()
-        cursor.close()
-        print(f"Inserted {inserted} new row(s)")
+        # Workers start with the default backend unless handed this one
+        with ProcessPoolExecutor(
+            max_workers=len(tasks),
+            initializer=set_backend,
+            initargs=(get_backend(),),
+        ) as pool:
+            for part_rows, part_inserted in pool.map(_insert_partition, tasks):
+                rows += part_rows
+                inserted += part_inserted
     except Error as e:
         print(f"Error inserting data: {e}")
+        return None
     except Exception as e:
-        print(f"Error reading CSV: {e}")
\ No newline at end of file
+        print(f"Error reading CSV: {e}")
+        return None
+    stats = _report(rows, inserted, started)
+    stats["workers"] = len(tasks)
+    return stats